@@ -1,13 +1,18 @@
 ﻿"""Application registry handling launch/focus semantics."""
 from __future__ import annotations
 
+import itertools
 import logging
 import os
+import re
+import select
 import shlex
 import subprocess
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
 
 from agent.platform.windows import window_manager
 from agent.schemas.config import AppConfigSchema, AppRegistrySchema
@@ -19,14 +24,51 @@ def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
+# Arguments ``shlex.quote`` would return unchanged (same character class).
+_SHELL_SAFE_ARG = re.compile(r"[\w@%+=:,./-]+", re.ASCII)
+
+_INSTANCE_COUNTER = itertools.count(1)
+_INSTANCE_PREFIX = f"{os.getpid():x}"
+
+
 def _make_instance_id() -> str:
-    return os.urandom(8).hex()
+    # Opaque, process-local key. The separator keeps ids from looking like a
+    # pid to ``_select_record``'s ``isdigit`` check.
+    return f"{_INSTANCE_PREFIX}-{next(_INSTANCE_COUNTER):x}"
+
+
+def _open_exit_handle(pid: int) -> tuple[Optional[Any], Optional[int]]:
+    """Return a poller/pidfd pair that becomes readable when *pid* exits.
+
+    Linux exposes process exit as a pollable pidfd, which lets waits block in
+    the kernel instead of looping over ``waitpid``. Other platforms return
+    ``(None, None)`` and rely on :meth:`subprocess.Popen.wait`, which already
+    blocks on the process handle on Windows.
+    """
+
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is None or not hasattr(select, "poll"):
+        return None, None
+    try:
+        fd = pidfd_open(pid)
+    except OSError:
+        return None, None
+    poller = select.poll()
+    poller.register(fd, select.POLLIN)
+    return poller, fd
 
 
 @dataclass
 class ApplicationDefinition:
     name: str
     config: AppConfigSchema
+    _base_args: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _base_env: Mapping[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Snapshot the launch baseline once; most launches add nothing to it.
+        self._base_args = tuple(self.config.args)
+        self._base_env = MappingProxyType(dict(self.config.env))
 
     def require_enabled(self) -> None:
         if not self.config.enabled:
@@ -40,24 +82,24 @@ class ApplicationDefinition:
         env_overrides: Optional[Mapping[str, str]] = None,
         inherit_env: Optional[bool] = None,
         working_dir: Optional[str] = None,
-    ) -> tuple[Sequence[str] | str, Mapping[str, str], bool, Optional[str]]:
+    ) -> tuple[Sequence[str] | str, Dict[str, str], bool, Optional[str]]:
         if not any([self.config.path, self.config.shell]):
             raise NotImplementedError(
                 "Only path and shell launch vectors are supported by the local runner."
             )
 
-        args = list(self.config.args)
-        if preset:
-            args.extend(self.config.presets.get(preset, []))
-        if extra_args:
-            args.extend(extra_args)
+        args: Sequence[str] = self._base_args
+        if preset or extra_args:
+            args = list(args)
+            if preset:
+                args.extend(self.config.presets.get(preset, []))
+            if extra_args:
+                args.extend(extra_args)
 
         cwd = working_dir or self.config.working_dir
         inherit = self.config.inherit_env if inherit_env is None else inherit_env
-        env: Dict[str, str] = {}
-        if inherit:
-            env.update(os.environ)
-        env.update(self.config.env)
+        env: Dict[str, str] = os.environ.copy() if inherit else {}
+        env.update(self._base_env)
         if env_overrides:
             env.update(env_overrides)
 
@@ -66,12 +108,21 @@ class ApplicationDefinition:
             use_shell = False
         else:
             shell_cmd = self.config.shell or ""
-            command = shell_cmd if not args else f"{shell_cmd} {shlex.join(args)}"
+            command = shell_cmd if not args else f"{shell_cmd} {_join_args(args)}"
             use_shell = True
 
         return command, env, use_shell, cwd
 
 
+def _join_args(args: Sequence[str]) -> str:
+    """Equivalent to :func:`shlex.join`, skipping the quoter when nothing needs it."""
+
+    fullmatch = _SHELL_SAFE_ARG.fullmatch
+    if all(fullmatch(arg) for arg in args):
+        return " ".join(args)
+    return shlex.join(args)
+
+
 @dataclass
 class WindowRecord:
     hwnd: int
@@ -83,6 +134,23 @@ class WindowRecord:
     process_name: str
     pid: int
     last_seen: datetime
+    state_key: tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.state_key = _window_state_key(self)
+
+
+def _window_state_key(window) -> tuple:
+    """Fields that identify an unchanged window between two snapshots."""
+
+    return (
+        window.pid,
+        window.title,
+        window.class_name,
+        window.bounds,
+        window.is_visible,
+        window.is_minimized,
+    )
 
 
 @dataclass
@@ -95,25 +163,76 @@ class ApplicationProcess:
     instance_id: str = field(default_factory=_make_instance_id)
     pid: int | None = None
     windows: Dict[int, WindowRecord] = field(default_factory=dict)
+    windows_refreshed_at: float = field(default=0.0, repr=False, compare=False)
+    exit_poller: Optional[Any] = field(default=None, repr=False, compare=False)
+    exit_fd: Optional[int] = field(default=None, repr=False, compare=False)
 
     def has_live_process(self) -> bool:
-        return bool(self.process and self.process.poll() is None)
+        process = self.process
+        if process is None or process.returncode is not None:
+            return False
+        if self.exit_poller is None:
+            return process.poll() is None
+        return not self.wait_for_exit(0)
+
+    def wait_for_exit(self, timeout: float) -> bool:
+        """Block until the process exits or *timeout* elapses.
+
+        Returns ``True`` once the process has exited and been reaped.
+        """
+
+        process = self.process
+        if process is None or process.returncode is not None:
+            return True
+        if self.exit_poller is None:
+            try:
+                process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                return False
+            return True
+        if not self.exit_poller.poll(max(0, int(timeout * 1000))):
+            return False
+        process.wait()
+        self._release_exit_handle()
+        return True
+
+    def _release_exit_handle(self) -> None:
+        if self.exit_fd is not None:
+            os.close(self.exit_fd)
+        self.exit_fd = None
+        self.exit_poller = None
 
     def has_live_window(self) -> bool:
-        return any(window_manager.is_window(hwnd) for hwnd in self.windows)
+        is_window = window_manager.is_window
+        return any(is_window(hwnd) for hwnd in self.windows)
 
 
 class ApplicationRegistry:
-    def __init__(self, apps: Dict[str, AppConfigSchema], *, wm=window_manager):
-        self._apps = {name: ApplicationDefinition(name, cfg) for name, cfg in apps.items()}
-        self._running: Dict[str, List[ApplicationProcess]] = {}
-        self._instances: Dict[str, ApplicationProcess] = {}
+    def __init__(
+        self,
+        apps: Dict[str, AppConfigSchema],
+        *,
+        wm=window_manager,
+        snapshot_ttl: float = 0.075,
+    ):
+        self._schemas: Dict[str, AppConfigSchema] = dict(apps)
+        self._apps: Dict[str, ApplicationDefinition] = {}
+        # Live records per app keyed by instance_id (insertion ordered, so the
+        # last entry is the latest launch) plus a secondary index by pid.
+        self._by_name: Dict[str, Dict[str, ApplicationProcess]] = {}
+        self._by_pid: Dict[int, ApplicationProcess] = {}
         self._window_manager = wm
+        self._snapshot_ttl = snapshot_ttl
+        self._snapshot_cache: Dict[str, tuple[float, list]] = {}
 
     def get(self, name: str) -> ApplicationDefinition:
-        if name not in self._apps:
-            raise KeyError(f"Application '{name}' is not registered.")
-        return self._apps[name]
+        definition = self._apps.get(name)
+        if definition is None:
+            config = self._schemas.get(name)
+            if config is None:
+                raise KeyError(f"Application '{name}' is not registered.")
+            definition = self._apps[name] = ApplicationDefinition(name, config)
+        return definition
 
     def start(
         self,
@@ -127,18 +246,12 @@ class ApplicationRegistry:
     ) -> ApplicationProcess:
         definition = self.get(name)
         definition.require_enabled()
-        self._purge_stopped(name)
-        self._remove_inactive_records(name)
-
-        policy = definition.config.window.single_instance
-        running = self._running.get(name, [])
-        if policy == "detect" and running:
-            raise RuntimeError(f"Application '{name}' is already running (single_instance=detect).")
-        if policy == "force" and running:
-            LOGGER.info("single_instance=force - terminating existing %s instances", name)
-            for process in list(running):
-                self._force_kill(process)
-            self._purge_stopped(name)
+        self._reap(name)
+
+        running = self._by_name.get(name)
+        if running:
+            policy = definition.config.window.single_instance
+            self._POLICY_HANDLERS[policy](self, name, running)
 
         command, env_vars, use_shell, cwd = definition.build_launch_plan(
             preset=preset,
@@ -153,20 +266,39 @@ class ApplicationRegistry:
             command,
             shell=use_shell,
             cwd=cwd or None,
-            env=dict(env_vars),
+            env=env_vars,
             text=True,
         )
 
         record = ApplicationProcess(definition=definition, process=process, preset=preset, pid=process.pid)
+        record.exit_poller, record.exit_fd = _open_exit_handle(process.pid)
+        self._invalidate_snapshots(name)
         self._update_windows(record, require_visible=True)
         if record.windows:
             record.pid = next(iter(record.windows.values())).pid
         else:
             LOGGER.debug("No window detected for %s immediately after launch", name)
-        self._running.setdefault(name, []).append(record)
-        self._instances[record.instance_id] = record
+        self._register(record)
         return record
 
+    def _policy_detect(self, name: str, running: Dict[str, ApplicationProcess]) -> None:
+        raise RuntimeError(f"Application '{name}' is already running (single_instance=detect).")
+
+    def _policy_force(self, name: str, running: Dict[str, ApplicationProcess]) -> None:
+        LOGGER.info("single_instance=force - terminating existing %s instances", name)
+        for process in list(running.values()):
+            self._force_kill(process)
+        self._reap(name)
+
+    def _policy_allow(self, name: str, running: Dict[str, ApplicationProcess]) -> None:
+        return None
+
+    _POLICY_HANDLERS = {
+        "detect": _policy_detect,
+        "force": _policy_force,
+        "allow": _policy_allow,
+    }
+
     def focus(self, name: str, *, target: str | int | None = "latest") -> ApplicationProcess:
         record = self._ensure_running_record(name, target)
         hwnd = self._primary_window(record)
@@ -211,18 +343,17 @@ class ApplicationRegistry:
         records = self._select_records(name, all_instances=all_instances)
         if not records:
             raise RuntimeError(f"Application '{name}' is not running.")
+        close_window = self._window_manager.close_window
         for record in records:
-            if record.process and record.process.poll() is None:
+            if record.has_live_process():
                 record.process.terminate()
-                try:
-                    record.process.wait(timeout=timeout)
-                except subprocess.TimeoutExpired:
-                    if force:
-                        self._force_kill(record)
-            for hwnd in list(record.windows):
-                self._window_manager.close_window(hwnd)
-            record.windows.clear()
-        self._purge_stopped(name)
+                if not record.wait_for_exit(timeout) and force:
+                    self._force_kill(record)
+            popitem = record.windows.popitem
+            while record.windows:
+                close_window(popitem()[0])
+        self._invalidate_snapshots(name)
+        self._reap(name)
 
     def kill(self, name: str, *, all_instances: bool = False) -> None:
         records = self._select_records(name, all_instances=all_instances)
@@ -230,34 +361,78 @@ class ApplicationRegistry:
             raise RuntimeError(f"Application '{name}' is not running.")
         for record in records:
             self._force_kill(record)
-        self._purge_stopped(name)
+        self._invalidate_snapshots(name)
+        self._reap(name)
 
     def is_running(self, name: str) -> bool:
-        self._purge_stopped(name)
-        return bool(self._running.get(name))
+        self._reap(name)
+        return bool(self._by_name.get(name))
 
     def running_processes(self, name: str) -> List[ApplicationProcess]:
-        self._purge_stopped(name)
-        return list(self._running.get(name, []))
+        self._reap(name)
+        return list(self._by_name.get(name, {}).values())
+
+    def _register(self, record: ApplicationProcess) -> None:
+        self._by_name.setdefault(record.definition.name, {})[record.instance_id] = record
+        if record.pid:
+            self._by_pid[record.pid] = record
+
+    def _unregister(self, record: ApplicationProcess) -> None:
+        records = self._by_name.get(record.definition.name)
+        if records is not None:
+            records.pop(record.instance_id, None)
+            if not records:
+                del self._by_name[record.definition.name]
+        if record.pid and self._by_pid.get(record.pid) is record:
+            del self._by_pid[record.pid]
 
     def _force_kill(self, record: ApplicationProcess) -> None:
-        if record.process and record.process.poll() is None:
+        if record.has_live_process():
             record.process.kill()
-            try:
-                record.process.wait(timeout=2.0)
-            except subprocess.TimeoutExpired:
+            if not record.wait_for_exit(2.0):
                 LOGGER.warning("Process %s did not exit after kill().", record.definition.name)
         elif record.pid:
             self._window_manager.terminate_process(record.pid)
-        for hwnd in list(record.windows):
-            self._window_manager.close_window(hwnd)
-            record.windows.pop(hwnd, None)
+        close_window = self._window_manager.close_window
+        popitem = record.windows.popitem
+        while record.windows:
+            close_window(popitem()[0])
+        self._invalidate_snapshots(record.definition.name)
+
+    def _snapshot(self, definition: ApplicationDefinition) -> list:
+        """Return window snapshots for *definition*, reusing very recent results.
+
+        Several registry calls re-read the same windows within a single user
+        action; a short TTL lets them share one enumeration.
+        """
+
+        now = time.monotonic()
+        cached = self._snapshot_cache.get(definition.name)
+        if cached is not None and now - cached[0] < self._snapshot_ttl:
+            return cached[1]
+        snapshots = self._window_manager.snapshot_windows(definition)
+        self._snapshot_cache[definition.name] = (now, snapshots)
+        return snapshots
+
+    def _invalidate_snapshots(self, name: str) -> None:
+        self._snapshot_cache.pop(name, None)
 
     def _update_windows(self, record: ApplicationProcess, *, require_visible: bool) -> None:
-        snapshots = self._window_manager.snapshot_windows(record.definition)
+        snapshots = self._snapshot(record.definition)
         now = _utcnow()
-        record.windows = {
-            snapshot.hwnd: WindowRecord(
+        make_record = WindowRecord
+        state_key = _window_state_key
+        previous = record.windows.get
+        windows: Dict[int, WindowRecord] = {}
+        for snapshot in snapshots:
+            if require_visible and not snapshot.is_visible:
+                continue
+            existing = previous(snapshot.hwnd)
+            if existing is not None and existing.state_key == state_key(snapshot):
+                existing.last_seen = now
+                windows[snapshot.hwnd] = existing
+                continue
+            windows[snapshot.hwnd] = make_record(
                 hwnd=snapshot.hwnd,
                 title=snapshot.title,
                 class_name=snapshot.class_name,
@@ -268,52 +443,39 @@ class ApplicationRegistry:
                 pid=snapshot.pid,
                 last_seen=now,
             )
-            for snapshot in snapshots
-            if not require_visible or snapshot.is_visible
-        }
+        record.windows = windows
+        record.windows_refreshed_at = time.monotonic()
         if record.windows:
-            record.pid = next(iter(record.windows.values())).pid
+            pid = next(iter(record.windows.values())).pid
+            if pid != record.pid:
+                if record.pid and self._by_pid.get(record.pid) is record:
+                    del self._by_pid[record.pid]
+                record.pid = pid
+                if pid:
+                    self._by_pid[pid] = record
 
     def _primary_window(self, record: ApplicationProcess) -> Optional[int]:
-        self._update_windows(record, require_visible=False)
+        # Callers have usually refreshed the record moments ago while
+        # resolving it; only re-read when that view is empty or stale.
+        if not record.windows or time.monotonic() - record.windows_refreshed_at >= self._snapshot_ttl:
+            self._update_windows(record, require_visible=False)
         for hwnd, info in record.windows.items():
             if info.is_visible and not info.is_minimized:
                 return hwnd
         return next(iter(record.windows), None)
 
-    def _purge_stopped(self, name: str) -> None:
-        records = self._running.get(name)
-        if not records:
-            return
-        alive: List[ApplicationProcess] = []
-        for record in records:
-            self._update_windows(record, require_visible=False)
-            has_process = record.has_live_process()
-            has_window = bool(record.windows)
-            if has_process or has_window:
-                alive.append(record)
-            else:
-                self._instances.pop(record.instance_id, None)
-        if alive:
-            self._running[name] = alive
-        else:
-            self._running.pop(name, None)
+    def _reap(self, name: str) -> None:
+        """Drop records for *name* that have neither a live process nor a window."""
 
-    def _remove_inactive_records(self, name: str) -> None:
-        records = self._running.get(name, [])
+        records = self._by_name.get(name)
         if not records:
             return
-        kept: List[ApplicationProcess] = []
-        for record in records:
-            self._update_windows(record, require_visible=False)
-            if record.windows or record.has_live_process():
-                kept.append(record)
-            else:
-                self._instances.pop(record.instance_id, None)
-        if kept:
-            self._running[name] = kept
-        else:
-            self._running.pop(name, None)
+        update_windows = self._update_windows
+        unregister = self._unregister
+        for record in list(records.values()):
+            update_windows(record, require_visible=False)
+            if not (record.windows or record.has_live_process()):
+                unregister(record)
 
     def _select_records(
         self,
@@ -321,36 +483,41 @@ class ApplicationRegistry:
         *,
         all_instances: bool = False,
     ) -> List[ApplicationProcess]:
-        self._purge_stopped(name)
-        records = self._running.get(name, [])
+        self._reap(name)
+        records = self._by_name.get(name)
         if not records:
             return []
         if all_instances:
-            return list(records)
-        return [records[-1]]
+            return list(records.values())
+        return [next(reversed(records.values()))]
 
     def _select_record(
         self,
         name: str,
         target: str | int | None = "latest",
     ) -> Optional[ApplicationProcess]:
-        self._purge_stopped(name)
-        records = self._running.get(name, [])
+        self._reap(name)
+        records = self._by_name.get(name)
         if not records:
             return None
         if target in (None, "latest"):
-            return records[-1]
+            return next(reversed(records.values()))
         if target == "first":
-            return records[0]
+            return next(iter(records.values()))
         if isinstance(target, int):
-            for record in records:
+            record = self._by_pid.get(target)
+            if record is not None and records.get(record.instance_id) is record:
+                return record
+            # Several instances can report the same window pid; fall back to a
+            # scan when the index points at a different app or was displaced.
+            for record in records.values():
                 if record.pid == target:
                     return record
             return None
         if isinstance(target, str):
             if target.isdigit():
                 return self._select_record(name, int(target))
-            return self._instances.get(target)
+            return records.get(target)
         raise ValueError(f"Unsupported focus target '{target}'.")
 
     def _ensure_running_record(
@@ -364,7 +531,7 @@ class ApplicationRegistry:
         self._update_windows(record, require_visible=False)
         if record.has_live_process() or record.windows:
             return record
-        self._purge_stopped(name)
+        self._reap(name)
         raise RuntimeError(f"Application '{name}' is not running.")
 
     @classmethod
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import argparse
 import logging
+import os
 import threading
 
 from agent.apps.registry import ApplicationRegistry
@@ -21,6 +22,10 @@ except Exception:  # pragma: no cover - fallback on non-Windows hosts
 
 LOGGER = logging.getLogger(__name__)
 
+# Lock waits are not interruptible by Ctrl+C on Windows, so the main thread
+# waits in slices there to let KeyboardInterrupt through.
+_WINDOWS_WAIT_SLICE = 0.5
+
 
 def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Local RPA agent")
@@ -56,6 +61,16 @@ def build_arg_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def _block_until_shutdown(watcher: IntentWatcher) -> None:
+    """Park the main thread until the watcher stops or Ctrl+C arrives."""
+
+    if os.name != "nt":
+        watcher.wait()
+        return
+    while not watcher.wait(_WINDOWS_WAIT_SLICE):
+        pass
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = build_arg_parser()
     args = parser.parse_args(argv)
@@ -72,24 +87,39 @@ def main(argv: list[str] | None = None) -> int:
 
     apps = ApplicationRegistry.from_schema(config.apps)
     state = StateStore(config.state)
-    runner = RecipeRunner(apps=apps, state=state, allow_focus_tap=args.allow_focus_tap)
+    runner = RecipeRunner(
+        apps=apps,
+        state=state,
+        allow_focus_tap=args.allow_focus_tap,
+        json_cache=config.recipes.json_cache,
+    )
 
     features = config.features
     enable_chat_bridge = features.chat_bridge if args.chat_bridge is None else args.chat_bridge
     enable_ocr_intents = features.ocr_intents if args.ocr_intents is None else args.ocr_intents
 
     mappings: dict[str, IntentMapping] = {}
+    # Several intents often share a recipe; resolve each file only once.
+    mappings_by_recipe: dict[str, IntentMapping] = {}
+    recipes_dir = config.recipes.directory
     for name, spec in config.intent_map.items():
         recipe_name = spec.get("recipe")
         if not recipe_name:
             LOGGER.warning("Intent '%s' missing recipe mapping; skipping", name)
             continue
-        recipe_path = (config.recipes.directory / recipe_name).resolve()
-        mappings[name] = IntentMapping(recipe=recipe_path)
+        mapping = mappings_by_recipe.get(recipe_name)
+        if mapping is None:
+            mapping = IntentMapping(recipe=(recipes_dir / recipe_name).resolve())
+            mappings_by_recipe[recipe_name] = mapping
+        mappings[name] = mapping
 
     if not mappings:
         LOGGER.warning("No intent mappings configured; intent watcher will be idle.")
 
+    # Parse every mapped recipe now so the first intent does not pay for it
+    # and broken recipes show up at startup.
+    runner.preload(mapping.recipe for mapping in mappings_by_recipe.values())
+
     if args.dry_run:
         LOGGER.info("Dry-run mode enabled; not starting intent watcher.")
         return 0
@@ -176,7 +206,7 @@ def main(argv: list[str] | None = None) -> int:
         if enable_chat_bridge and bridge is not None:
             bridge.run()
         else:
-            watcher._stop_event.wait()
+            _block_until_shutdown(watcher)
     except KeyboardInterrupt:
         LOGGER.info("Keyboard interrupt received; shutting down.")
     finally:
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import os
+import re
 from pathlib import Path
 from typing import Any, Dict
 
@@ -10,9 +11,19 @@ try:  # pragma: no cover - exercised indirectly during tests
 except ImportError:  # pragma: no cover - fallback path covered indirectly
     yaml = None
 
+# Prefer the libyaml-backed loader when PyYAML was built with it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", None) or getattr(yaml, "SafeLoader", None)
+
 from agent.core.logger import configure_logging
 from agent.schemas.config import ConnectorConfigSchema
 
+# ``$VAR`` and ``${VAR}`` everywhere, plus ``%VAR%`` on Windows, mirroring the
+# forms ``os.path.expandvars`` understands on each platform.
+if os.name == "nt":
+    _ENV_VAR_PATTERN = re.compile(r"\$([A-Za-z0-9_-]+)|\$\{([^}]*)\}|%([^%]+)%")
+else:
+    _ENV_VAR_PATTERN = re.compile(r"\$(\w+)|\$\{([^}]*)\}", re.ASCII)
+
 
 class ConfigLoader:
     """Load and validate configuration files."""
@@ -26,8 +37,7 @@ class ConfigLoader:
         if not path.is_absolute():
             path = self._base_path / path
 
-        with path.open("r", encoding="utf-8") as handle:
-            raw_config = _load_config(handle)
+        raw_config = _load_config(path.read_bytes())
 
         config = ConnectorConfigSchema.parse_obj(raw_config)
         return config
@@ -47,36 +57,86 @@ def bootstrap_config(path: str | Path) -> ConnectorConfigSchema:
 def _expand_env_vars(config: ConnectorConfigSchema) -> None:
     """Recursively expand environment variables in selected config fields."""
 
+    cache: Dict[str, str] = {}
+
+    def expand(value: str) -> str:
+        return _expand(value, cache)
+
     for provider in config.llm.providers.values():
         if provider.api_key:
-            provider.api_key = os.path.expandvars(provider.api_key)
+            provider.api_key = expand(provider.api_key)
         if provider.endpoint:
-            provider.endpoint = os.path.expandvars(provider.endpoint)
+            provider.endpoint = expand(provider.endpoint)
 
     for profile in config.profiles.definitions.values():
-        profile.toggles.network_allow = [os.path.expandvars(p) for p in profile.toggles.network_allow]
-        profile.toggles.filesystem_allow = [os.path.expandvars(p) for p in profile.toggles.filesystem_allow]
+        profile.toggles.network_allow = [expand(p) for p in profile.toggles.network_allow]
+        profile.toggles.filesystem_allow = [expand(p) for p in profile.toggles.filesystem_allow]
 
-    config.safety.panic_hotkey = os.path.expandvars(config.safety.panic_hotkey)
-    config.intents.directory = Path(os.path.expandvars(str(config.intents.directory)))
-    config.intents.archive_directory = Path(os.path.expandvars(str(config.intents.archive_directory)))
-    config.recipes.directory = Path(os.path.expandvars(str(config.recipes.directory)))
+    config.safety.panic_hotkey = expand(config.safety.panic_hotkey)
+    _expand_path(config.intents, "directory", cache)
+    _expand_path(config.intents, "archive_directory", cache)
+    _expand_path(config.recipes, "directory", cache)
 
     for mapping in config.intent_map.values():
         if "recipe" in mapping:
-            mapping["recipe"] = os.path.expandvars(mapping["recipe"])
+            mapping["recipe"] = expand(mapping["recipe"])
+
+
+def _expand_path(owner: Any, attr: str, cache: Dict[str, str]) -> None:
+    """Expand environment references in the path stored at ``owner.attr``."""
+
+    raw = os.fspath(getattr(owner, attr))
+    expanded = _expand(raw, cache)
+    if expanded is not raw:
+        setattr(owner, attr, Path(expanded))
+
+
+def _expand(value: str, cache: Dict[str, str]) -> str:
+    """Expand environment references in *value*, memoizing each variable in *cache*.
+
+    Unknown variables are left untouched, as with :func:`os.path.expandvars`.
+    """
+
+    if "$" not in value and "%" not in value:
+        return value
+    if os.name == "nt" and _needs_ntpath_rules(value):
+        return os.path.expandvars(value)
+
+    def substitute(match: re.Match[str]) -> str:
+        token = match.group(0)
+        expanded = cache.get(token)
+        if expanded is None:
+            expanded = cache[token] = os.environ.get(match.group(match.lastindex), token)
+        return expanded
+
+    return _ENV_VAR_PATTERN.sub(substitute, value)
+
+
+def _needs_ntpath_rules(value: str) -> bool:
+    """Return ``True`` when *value* relies on ntpath rules the pattern lacks.
+
+    ntpath keeps ``'...'`` literal, treats ``$$`` and ``%%`` as escapes and
+    stops expanding at an unterminated ``%`` or ``${``.
+    """
 
+    return (
+        "'" in value
+        or "$$" in value
+        or "%%" in value
+        or value.count("%") % 2 == 1
+        or value.rfind("${") > value.rfind("}")
+    )
 
-def _load_config(handle: Any) -> Dict[str, Any]:
-    text = handle.read()
 
+def _load_config(raw: bytes) -> Dict[str, Any]:
+    # Both parsers detect the encoding (and any BOM) from the raw bytes.
     if yaml is not None:
-        return yaml.safe_load(text) or {}
+        return yaml.load(raw, Loader=_YAML_LOADER) or {}
 
     import json
 
     try:
-        data = json.loads(text or "{}")
+        data = json.loads(raw or b"{}")
     except json.JSONDecodeError as exc:  # pragma: no cover - defensive
         raise ValueError("Failed to parse configuration. Install PyYAML for full YAML support.") from exc
 
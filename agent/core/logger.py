@@ -2,12 +2,14 @@
 from __future__ import annotations
 
 import logging
+import sys
 from pathlib import Path
 from typing import Optional
 
 _DEFAULT_FORMAT = (
     "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
 )
+_FORMATTER = logging.Formatter(_DEFAULT_FORMAT)
 
 
 def configure_logging(level: int = logging.INFO, logfile: Optional[Path] = None) -> None:
@@ -25,19 +27,37 @@ def configure_logging(level: int = logging.INFO, logfile: Optional[Path] = None)
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
 
+    if logfile is None and _is_configured(root_logger):
+        # The handler captured ``sys.stderr`` when it was created; follow it if
+        # the stream has since been swapped (e.g. by a test harness).
+        handler = root_logger.handlers[0]
+        if handler.stream is not sys.stderr:
+            handler.setStream(sys.stderr)
+        return
+
     # Remove existing handlers to avoid duplicate logs when re-configuring.
     for handler in list(root_logger.handlers):
         root_logger.removeHandler(handler)
 
     stream_handler = logging.StreamHandler()
-    stream_handler.setFormatter(logging.Formatter(_DEFAULT_FORMAT))
+    stream_handler.setFormatter(_FORMATTER)
     root_logger.addHandler(stream_handler)
 
     if logfile is not None:
         logfile.parent.mkdir(parents=True, exist_ok=True)
         file_handler = logging.FileHandler(logfile, encoding="utf-8")
-        file_handler.setFormatter(logging.Formatter(_DEFAULT_FORMAT))
+        file_handler.setFormatter(_FORMATTER)
         root_logger.addHandler(file_handler)
 
 
+def _is_configured(root_logger: logging.Logger) -> bool:
+    """Return ``True`` when *root_logger* only has our stderr handler attached."""
+
+    handlers = root_logger.handlers
+    if len(handlers) != 1:
+        return False
+    handler = handlers[0]
+    return type(handler) is logging.StreamHandler and handler.formatter is _FORMATTER
+
+
 __all__ = ["configure_logging"]
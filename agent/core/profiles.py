@@ -1,7 +1,7 @@
 """Runtime profile and toggle management."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import Dict, Iterable, Iterator
 
 from agent.schemas.config import ConnectorConfigSchema, ProfileDefinitionSchema
@@ -17,6 +17,9 @@ class RuntimeToggles:
     filesystem_allow: tuple[str, ...]
 
 
+_TOGGLE_NAMES = frozenset(field.name for field in fields(RuntimeToggles))
+
+
 class ProfileManager:
     """Manage active profile and runtime toggles for the agent."""
 
@@ -26,6 +29,7 @@ class ProfileManager:
         self._profiles = profiles
         self._active = default
         self._overrides: Dict[str, bool | tuple[str, ...]] = {}
+        self._toggles_cache: RuntimeToggles | None = None
 
     @property
     def active_profile(self) -> str:
@@ -36,17 +40,22 @@ class ProfileManager:
             raise KeyError(f"Profile '{profile}' not defined")
         self._active = profile
         self._overrides.clear()
+        self._toggles_cache = None
 
     def iter_profiles(self) -> Iterator[str]:
         yield from self._profiles
 
     def set_toggle(self, name: str, value: bool) -> None:
-        definition = getattr(self.current_toggles(), name, None)
-        if definition is None:
+        if name not in _TOGGLE_NAMES:
             raise AttributeError(f"Unknown toggle '{name}'")
         self._overrides[name] = value
+        self._toggles_cache = None
 
     def current_toggles(self) -> RuntimeToggles:
+        # RuntimeToggles is frozen and holds tuples, so one instance can be
+        # shared until activate() or set_toggle() changes the inputs.
+        if self._toggles_cache is not None:
+            return self._toggles_cache
         profile = self._profiles[self._active]
         toggles = profile.toggles
         override_idle = self._overrides.get("idle_only", toggles.idle_only)
@@ -55,7 +64,7 @@ class ProfileManager:
         override_elev = self._overrides.get("elevation", toggles.elevation)
         override_network = self._overrides.get("network_allow", tuple(toggles.network_allow))
         override_fs = self._overrides.get("filesystem_allow", tuple(toggles.filesystem_allow))
-        return RuntimeToggles(
+        self._toggles_cache = RuntimeToggles(
             idle_only=bool(override_idle),
             foreground_required=bool(override_fg),
             coordinate_clicks=bool(override_coord),
@@ -63,6 +72,7 @@ class ProfileManager:
             network_allow=tuple(override_network),
             filesystem_allow=tuple(override_fs),
         )
+        return self._toggles_cache
 
     @classmethod
     def from_config(cls, config: ConnectorConfigSchema) -> "ProfileManager":
@@ -8,6 +8,24 @@ from typing import Callable, Dict, Optional, Tuple
 
 import yaml
 
+try:  # pragma: no cover - optional accelerator
+    import orjson  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - stdlib json is used instead
+    orjson = None
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_PROMPT_TEMPLATE = (
+    "You are a routing assistant. Given an utterance, choose the most appropriate intent\n"
+    "and return a JSON object with keys 'intent' and optional 'args'.\n"
+    "If no intent matches, respond with an empty JSON object {{}}.\n\n"
+    "Utterance: {utterance}\n\n"
+    "Intent catalog: {manifest}\n"
+)
+
+# Rendered catalog text keyed by (manifest path, mtime) so edits are picked up.
+_PROMPT_CACHE: Dict[Tuple[Path, int], str] = {}
+
 
 @dataclass
 class LLMRouteResult:
@@ -16,7 +34,18 @@ class LLMRouteResult:
 
 
 def build_prompt(utterance: str, manifest_path: Path) -> str:
-    manifest = yaml.safe_load(manifest_path.read_text(encoding="utf-8")) or {}
+    key = (manifest_path, manifest_path.stat().st_mtime_ns)
+    manifest_text = _PROMPT_CACHE.get(key)
+    if manifest_text is None:
+        manifest_text = _render_manifest(manifest_path)
+        for stale in [cached for cached in _PROMPT_CACHE if cached[0] == manifest_path]:
+            del _PROMPT_CACHE[stale]
+        _PROMPT_CACHE[key] = manifest_text
+    return _PROMPT_TEMPLATE.format(utterance=utterance, manifest=manifest_text)
+
+
+def _render_manifest(manifest_path: Path) -> str:
+    manifest = yaml.load(manifest_path.read_bytes(), Loader=_YAML_LOADER) or {}
     snippets = []
     for entry in manifest.get("intents", [])[:20]:
         snippets.append(
@@ -27,20 +56,15 @@ def build_prompt(utterance: str, manifest_path: Path) -> str:
                 "synonyms": entry.get("synonyms", []),
             }
         )
-    manifest_text = json.dumps(snippets, indent=2)
-    return (
-        "You are a routing assistant. Given an utterance, choose the most appropriate intent\n"
-        "and return a JSON object with keys 'intent' and optional 'args'.\n"
-        "If no intent matches, respond with an empty JSON object {}.\n\n"
-        f"Utterance: {utterance}\n\n"
-        f"Intent catalog: {manifest_text}\n"
-    )
+    # Rendered once per manifest version, so the stdlib encoder keeps the
+    # prompt text (ASCII escapes included) exactly as it has always been.
+    return json.dumps(snippets, indent=2)
 
 
 def parse_response(response: str) -> Optional[LLMRouteResult]:
     try:
-        data = json.loads(response)
-    except json.JSONDecodeError:
+        data = orjson.loads(response) if orjson is not None else json.loads(response)
+    except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses this
         return None
     if not isinstance(data, dict) or "intent" not in data or not data["intent"]:
         return None
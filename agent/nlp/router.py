@@ -2,23 +2,48 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+import sys
+from collections import defaultdict
+from functools import lru_cache
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 import yaml
 
+try:  # pragma: no cover - optional C accelerator
+    import ahocorasick  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - pure-Python matcher is used instead
+    ahocorasick = None
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
 @dataclass
 class IntentDefinition:
     name: str
     recipe: str
     description: str
     args: List[str]
-    synonyms: List[str]
+    synonyms: Tuple[str, ...]
+    allowed_args: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    keyword: str = field(init=False, repr=False, compare=False)
+    search_text: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.allowed_args = frozenset(self.args)
+        # Utterances are lowercased before matching, so the name is matched
+        # through a lowercase copy while ``name`` keeps its manifest spelling.
+        self.keyword = sys.intern(self.name.lower())
+        # Lowercase catalog text for topic filters; NUL keeps a topic from
+        # matching across two fields.
+        self.search_text = "\0".join(
+            [self.name, self.description, self.recipe, *self.synonyms]
+        ).lower()
 
     def match_score(self, utterance: str) -> int:
         base = 0
-        if self.name in utterance:
+        if self.keyword in utterance:
             base += 3
         for synonym in self.synonyms:
             if synonym in utterance:
@@ -27,10 +52,10 @@ class IntentDefinition:
 
 
 def load_intents(manifest_path: Path) -> Dict[str, IntentDefinition]:
-    data = yaml.safe_load(manifest_path.read_text(encoding="utf-8")) or {}
+    data = yaml.load(manifest_path.read_bytes(), Loader=_YAML_LOADER) or {}
     intents: Dict[str, IntentDefinition] = {}
     for row in data.get("intents", []):
-        name = row.get("intent", "").strip()
+        name = sys.intern(row.get("intent", "").strip())
         if not name:
             continue
         intents[name] = IntentDefinition(
@@ -38,21 +63,79 @@ def load_intents(manifest_path: Path) -> Dict[str, IntentDefinition]:
             recipe=row.get("recipe", ""),
             description=row.get("description", ""),
             args=list(row.get("args", [])),
-            synonyms=[syn.strip() for syn in row.get("synonyms", []) if syn.strip()],
+            synonyms=tuple(
+                sys.intern(synonym)
+                for synonym in (syn.strip().lower() for syn in row.get("synonyms", []))
+                if synonym
+            ),
         )
     return intents
 
 
-_INTENT_CACHE: Dict[Path, Dict[str, IntentDefinition]] = {}
-
-
-def _get_manifest(manifest_path: Path) -> Dict[str, IntentDefinition]:
-    if manifest_path not in _INTENT_CACHE:
-        _INTENT_CACHE[manifest_path] = load_intents(manifest_path)
-    return _INTENT_CACHE[manifest_path]
+class _KeywordMatcher:
+    """Score every intent of a manifest against an utterance in one pass.
+
+    Scores follow :meth:`IntentDefinition.match_score`: 3 when the intent name
+    occurs in the utterance plus 2 per matching synonym. With ``pyahocorasick``
+    installed the utterance is scanned once by an Aho-Corasick automaton;
+    otherwise a flat ``(needle, weight, intent)`` table is tested in one loop.
+    """
+
+    def __init__(self, manifest: Dict[str, IntentDefinition]) -> None:
+        needles: List[Tuple[str, int, str]] = []
+        for definition in manifest.values():
+            needles.append((definition.keyword, 3, definition.name))
+            needles.extend((synonym, 2, definition.name) for synonym in definition.synonyms)
+        self._needles: Tuple[Tuple[str, int, str], ...] = tuple(needles)
+        self._weights: Dict[str, List[Tuple[str, int]]] = {}
+        self._automaton = None
+        if ahocorasick is not None and needles:
+            for needle, weight, name in needles:
+                self._weights.setdefault(needle, []).append((name, weight))
+            automaton = ahocorasick.Automaton()
+            for needle in self._weights:
+                automaton.add_word(needle, needle)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def scores(self, utterance: str) -> Dict[str, int]:
+        totals: Dict[str, int] = defaultdict(int)
+        if self._automaton is not None:
+            for needle in {needle for _, needle in self._automaton.iter(utterance)}:
+                for name, weight in self._weights[needle]:
+                    totals[name] += weight
+        else:
+            for needle, weight, name in self._needles:
+                if needle in utterance:
+                    totals[name] += weight
+        return totals
+
+
+# Parsed manifests keyed by (resolved path, mtime) so edits are picked up and
+# equivalent spellings of the same path share one entry.
+_INTENT_CACHE: Dict[Tuple[str, int], Tuple[Dict[str, IntentDefinition], _KeywordMatcher]] = {}
+
+
+def _manifest_key(manifest_path: Path) -> Tuple[str, int]:
+    """Load *manifest_path* into the cache if needed and return its cache key."""
+
+    resolved = str(manifest_path.resolve())
+    key = (resolved, manifest_path.stat().st_mtime_ns)
+    if key not in _INTENT_CACHE:
+        manifest = load_intents(manifest_path)
+        stale = [cached for cached in _INTENT_CACHE if cached[0] == resolved]
+        for cached in stale:
+            del _INTENT_CACHE[cached]
+        if stale:
+            _route_cached.cache_clear()
+        _INTENT_CACHE[key] = (manifest, _KeywordMatcher(manifest))
+    return key
 
 
 _PARAM_PATTERN = re.compile(r"(\w+)\s*[:=]\s*([\w./:-]+)")
+# Searched separately over the whole utterance: "for"/"about" may sit inside a
+# key=value pair (e.g. ``value=for x``) and must still yield a topic.
+_TOPIC_PATTERN = re.compile(r"(?:for|about)\s+([\w.-]+)")
 
 
 def parse_args(utterance: str) -> Dict[str, str]:
@@ -60,7 +143,7 @@ def parse_args(utterance: str) -> Dict[str, str]:
     for key, value in _PARAM_PATTERN.findall(utterance):
         args[key.lower()] = value
     if "topic" not in args:
-        topic_match = re.search(r"(?:for|about)\s+([\w.-]+)", utterance)
+        topic_match = _TOPIC_PATTERN.search(utterance)
         if topic_match:
             args["topic"] = topic_match.group(1)
     return args
@@ -68,21 +151,45 @@ def parse_args(utterance: str) -> Dict[str, str]:
 
 
 
-def _score_candidates(utterance: str, manifest: Dict[str, IntentDefinition]) -> List[Tuple[str, int]]:
-    scores: List[Tuple[str, int]] = []
-    for definition in manifest.values():
-        score = definition.match_score(utterance)
-        if score > 0:
-            scores.append((definition.name, score))
+def _score_candidates(
+    utterance: str,
+    manifest: Dict[str, IntentDefinition],
+    matcher: _KeywordMatcher,
+) -> List[Tuple[str, int]]:
+    totals = matcher.scores(utterance)
+    # Walk the manifest so ties keep their declaration order.
+    scores = [(name, totals[name]) for name in manifest if name in totals]
     scores.sort(key=lambda item: item[1], reverse=True)
     return scores
 
+
+def _best_candidate(
+    utterance: str,
+    manifest: Dict[str, IntentDefinition],
+    matcher: _KeywordMatcher,
+    minimum_score: int,
+) -> Optional[str]:
+    """Return the top-scoring intent (first declared on ties) or ``None``."""
+
+    totals = matcher.scores(utterance)
+    if not totals:
+        return None
+    best_name: Optional[str] = None
+    best_score = 0
+    for name in manifest:
+        score = totals.get(name, 0)
+        if score > best_score:
+            best_name, best_score = name, score
+    if best_score < minimum_score:
+        return None
+    return best_name
+
 def rank(utterance: str, *, manifest_path: Path) -> List[Tuple[str, int]]:
     utterance_norm = (utterance or "").lower().strip()
     if not utterance_norm:
         return []
-    manifest = _get_manifest(manifest_path)
-    return _score_candidates(utterance_norm, manifest)
+    manifest, matcher = _INTENT_CACHE[_manifest_key(manifest_path)]
+    return _score_candidates(utterance_norm, manifest, matcher)
 
 def route(
     utterance: str,
@@ -94,20 +201,30 @@ def route(
     if not utterance_norm:
         return None
 
-    manifest = _get_manifest(manifest_path)
-    candidates = _score_candidates(utterance_norm, manifest)
-    if not candidates:
+    routed = _route_cached(utterance_norm, _manifest_key(manifest_path), minimum_score)
+    if routed is None:
         return None
-
-    best_name, best_score = candidates[0]
-    if best_score < minimum_score:
+    best_name, args = routed
+    return best_name, dict(args)
+
+
+@lru_cache(maxsize=1024)
+def _route_cached(
+    utterance_norm: str,
+    manifest_key: Tuple[str, int],
+    minimum_score: int,
+) -> Optional[Tuple[str, Tuple[Tuple[str, str], ...]]]:
+    manifest, matcher = _INTENT_CACHE[manifest_key]
+    best_name = _best_candidate(utterance_norm, manifest, matcher, minimum_score)
+    if best_name is None:
         return None
 
     definition = manifest[best_name]
     args = parse_args(utterance_norm)
-    if definition.args:
-        args = {key: value for key, value in args.items() if key in definition.args}
-    return best_name, args
+    allowed = definition.allowed_args
+    if allowed and not allowed.issuperset(args):
+        args = {key: value for key, value in args.items() if key in allowed}
+    return best_name, tuple(args.items())
 
 
-__all__ = ["route", "load_intents", "IntentDefinition"]
+__all__ = ["route", "rank", "load_intents", "IntentDefinition"]
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import ctypes
+import functools
 import logging
 import threading
 from typing import Callable
@@ -13,8 +14,17 @@ LOGGER = logging.getLogger(__name__)
 user32 = ctypes.windll.user32
 kernel32 = ctypes.windll.kernel32
 
+# The default c_int restype would truncate event handles on 64-bit Windows and
+# turn WAIT_FAILED into -1.
+kernel32.CreateEventW.restype = wintypes.HANDLE
+user32.MsgWaitForMultipleObjects.restype = wintypes.DWORD
+
 WM_HOTKEY = 0x0312
-WM_QUIT = 0x0012
+PM_REMOVE = 0x0001
+QS_ALLINPUT = 0x04FF
+INFINITE = 0xFFFFFFFF
+WAIT_OBJECT_0 = 0x00000000
+WAIT_FAILED = 0xFFFFFFFF
 
 MODIFIER_MAP = {
     "alt": 0x0001,
@@ -48,21 +58,21 @@ KEY_ALIASES = {
 }
 
 
+_ALL_KEYS = {
+    **{char: ord(char.upper()) for char in "abcdefghijklmnopqrstuvwxyz0123456789"},
+    **{f"f{index}": 0x70 + (index - 1) for index in range(1, 25)},
+    **KEY_ALIASES,
+}
+
+
 def _resolve_key(token: str) -> int:
-    lower = token.lower()
-    if lower in KEY_ALIASES:
-        return KEY_ALIASES[lower]
-    if lower.startswith("f") and lower[1:].isdigit():
-        index = int(lower[1:])
-        if 1 <= index <= 24:
-            return 0x70 + (index - 1)
-    if len(lower) == 1:
-        ch = lower.upper()
-        if "A" <= ch <= "Z" or "0" <= ch <= "9":
-            return ord(ch)
-    raise ValueError(f"Unsupported hotkey token '{token}'.")
+    try:
+        return _ALL_KEYS[token.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported hotkey token '{token}'.") from None
 
 
+@functools.lru_cache(maxsize=128)
 def parse_hotkey(sequence: str) -> tuple[int, int]:
     if not sequence:
         raise ValueError("Hotkey sequence must be provided.")
@@ -112,7 +122,7 @@ class GlobalHotKeyListener:
         self._modifiers, self._vk = parse_hotkey(sequence)
         self._id = self._allocate_id()
         self._thread: threading.Thread | None = None
-        self._thread_id: int | None = None
+        self._stop_handle: int | None = None
         self._stop_event = threading.Event()
         self._ready_event = threading.Event()
         self._registered = False
@@ -132,6 +142,9 @@ class GlobalHotKeyListener:
         self._stop_event.clear()
         self._ready_event.clear()
         self._error = None
+        self._stop_handle = self._kernel32.CreateEventW(None, True, False, None)
+        if not self._stop_handle:
+            raise RuntimeError(f"CreateEventW failed (error {ctypes.get_last_error()}).")
 
         thread = threading.Thread(target=self._run_loop, name="global-hotkey-listener", daemon=True)
         thread.start()
@@ -148,14 +161,21 @@ class GlobalHotKeyListener:
 
     def stop(self) -> None:
         self._stop_event.set()
-        thread_id = self._thread_id
-        if thread_id:
-            self._user32.PostThreadMessageW(thread_id, WM_QUIT, 0, 0)
+        stop_handle = self._stop_handle
+        if stop_handle:
+            self._kernel32.SetEvent(stop_handle)
         thread = self._thread
         if thread and thread.is_alive():
             thread.join(timeout=1)
+        if stop_handle:
+            if thread and thread.is_alive():
+                # The loop may still be waiting on the event; leak the handle
+                # rather than close it underneath the wait.
+                LOGGER.warning("Hotkey listener thread did not exit; leaving its stop event open.")
+            else:
+                self._kernel32.CloseHandle(stop_handle)
         self._thread = None
-        self._thread_id = None
+        self._stop_handle = None
         self._registered = False
 
     @property
@@ -163,7 +183,6 @@ class GlobalHotKeyListener:
         return bool(self._thread and self._thread.is_alive())
 
     def _run_loop(self) -> None:
-        self._thread_id = self._kernel32.GetCurrentThreadId()
         ctypes.set_last_error(0)
         try:
             if not self._user32.RegisterHotKey(None, self._id, self._modifiers, self._vk):
@@ -177,24 +196,30 @@ class GlobalHotKeyListener:
             self._registered = True
             self._ready_event.set()
 
+            # Wait on the stop event and the thread's input queue together so
+            # stop() only has to signal the event; queued messages are then
+            # drained without blocking.
+            handles = (wintypes.HANDLE * 1)(self._stop_handle)
             msg = wintypes.MSG()
             while not self._stop_event.is_set():
-                result = self._user32.GetMessageW(ctypes.byref(msg), None, 0, 0)
-                if result == 0 or self._stop_event.is_set():
+                result = self._user32.MsgWaitForMultipleObjects(
+                    1, handles, False, INFINITE, QS_ALLINPUT
+                )
+                if result == WAIT_OBJECT_0:
                     break
-                if result == -1:
+                if result == WAIT_FAILED:
                     LOGGER.warning(
-                        "Hotkey listener GetMessageW failed (error %s)",
+                        "Hotkey listener MsgWaitForMultipleObjects failed (error %s)",
                         ctypes.get_last_error(),
                     )
                     break
-                if msg.message == WM_HOTKEY and msg.wParam == self._id:
-                    self._invoke_callback()
+                while self._user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_REMOVE):
+                    if msg.message == WM_HOTKEY and msg.wParam == self._id:
+                        self._invoke_callback()
         finally:
             if self._registered:
                 self._user32.UnregisterHotKey(None, self._id)
                 self._registered = False
-            self._thread_id = None
             if not self._ready_event.is_set():
                 self._ready_event.set()
 
@@ -5,6 +5,7 @@ import ctypes
 import ctypes.wintypes as wintypes
 import time
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Iterable, Optional
 
 user32 = ctypes.windll.user32
@@ -25,6 +26,40 @@ PROCESS_TERMINATE = 0x0001
 
 @dataclass
 class WindowInfo:
+    """Enumerated top-level window.
+
+    Only the handle, owning pid and visibility are captured during
+    enumeration; the remaining attributes are queried on first access so
+    windows rejected by pid/visibility filters cost no further Win32 calls.
+    """
+
+    hwnd: int
+    pid: int
+    is_visible: bool
+
+    @cached_property
+    def title(self) -> str:
+        return _get_window_text(self.hwnd)
+
+    @cached_property
+    def class_name(self) -> str:
+        return _get_class_name(self.hwnd)
+
+    @cached_property
+    def bounds(self) -> tuple[int, int, int, int]:
+        return _get_window_rect(self.hwnd)
+
+    @cached_property
+    def is_minimized(self) -> bool:
+        return _is_iconic(self.hwnd)
+
+    @cached_property
+    def process_name(self) -> str:
+        return _get_process_name(self.pid)
+
+
+@dataclass
+class WindowSnapshot:
     hwnd: int
     title: str
     class_name: str
@@ -32,10 +67,6 @@ class WindowInfo:
     bounds: tuple[int, int, int, int]
     is_visible: bool
     is_minimized: bool
-
-
-@dataclass
-class WindowSnapshot(WindowInfo):
     process_name: str
     last_seen: float
 
@@ -85,16 +116,9 @@ def enumerate_windows() -> Iterable[WindowInfo]:
     def callback(hwnd: int, _lparam: int) -> bool:
         pid = wintypes.DWORD()
         user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
-        info = WindowInfo(
-            hwnd=hwnd,
-            title=_get_window_text(hwnd),
-            class_name=_get_class_name(hwnd),
-            pid=pid.value,
-            bounds=_get_window_rect(hwnd),
-            is_visible=bool(user32.IsWindowVisible(hwnd)),
-            is_minimized=_is_iconic(hwnd),
+        results.append(
+            WindowInfo(hwnd=hwnd, pid=pid.value, is_visible=bool(user32.IsWindowVisible(hwnd)))
         )
-        results.append(info)
         return True
 
     user32.EnumWindows(callback, 0)
@@ -118,7 +142,7 @@ def _matches(
         return False
     if class_match and info.class_name.lower() != class_match.lower():
         return False
-    if process_name and _get_process_name(info.pid).lower() != process_name.lower():
+    if process_name and info.process_name.lower() != process_name.lower():
         return False
     return True
 
@@ -130,18 +154,21 @@ def _find_candidates(
     require_visible: bool,
     include_hidden: bool,
 ) -> list[WindowInfo]:
-    title_match = getattr(definition.config.window, "title_match", None)
-    class_match = getattr(definition.config.window, "class_match", None)
-    process_name = getattr(definition.config.window, "process_name", None)
+    title_match = getattr(definition.config.window, "title_match", None) or None
+    class_match = getattr(definition.config.window, "class_match", None) or None
+    process_name = getattr(definition.config.window, "process_name", None) or None
 
+    # Enumerate once; the pid-less fallback re-filters the same windows, whose
+    # lazily fetched attributes are already cached from the first pass.
+    windows = list(enumerate_windows())
     candidates = [
         info
-        for info in enumerate_windows()
+        for info in windows
         if _matches(
             info,
-            title_match=title_match or None,
-            class_match=class_match or None,
-            process_name=process_name or None,
+            title_match=title_match,
+            class_match=class_match,
+            process_name=process_name,
             pid=pid,
             require_visible=require_visible,
         )
@@ -149,12 +176,12 @@ def _find_candidates(
     if not candidates and pid is not None and include_hidden:
         candidates = [
             info
-            for info in enumerate_windows()
+            for info in windows
             if _matches(
                 info,
-                title_match=title_match or None,
-                class_match=class_match or None,
-                process_name=process_name or None,
+                title_match=title_match,
+                class_match=class_match,
+                process_name=process_name,
                 pid=None,
                 require_visible=require_visible,
             )
@@ -200,7 +227,7 @@ def snapshot_windows(definition) -> list[WindowSnapshot]:
             bounds=info.bounds,
             is_visible=info.is_visible,
             is_minimized=info.is_minimized,
-            process_name=_get_process_name(info.pid),
+            process_name=info.process_name,
             last_seen=time.time(),
         )
         for info in matches
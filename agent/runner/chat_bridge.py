@@ -2,11 +2,14 @@
 from __future__ import annotations
 
 import logging
+import os
+import sys
+import tempfile
 from datetime import datetime
 from itertools import count
 from pathlib import Path
 from threading import Event
-from typing import Callable, Dict, Iterable, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 import yaml
 
@@ -16,6 +19,40 @@ from agent.nlp import router
 
 LOGGER = logging.getLogger(__name__)
 
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+# Intents are written here first; the watcher does not recurse into it.
+_STAGING_DIRNAME = ".staging"
+
+
+def _publish(staged: Path, destination: Path, text: str) -> bool:
+    """Hard-link *staged* to *destination*; ``False`` if the name is taken."""
+
+    try:
+        os.link(staged, destination)
+    except FileExistsError:
+        return False
+    except OSError:
+        # Volumes without hard links (FAT/exFAT, some SMB shares) get the
+        # exclusive-create write instead.
+        return _write_exclusive(destination, text)
+    return True
+
+
+# Exclusive create: claiming a filename and opening it is one atomic call.
+_CREATE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+
+
+def _write_exclusive(destination: Path, text: str) -> bool:
+    """Create *destination* with *text*; ``False`` if the name is taken."""
+
+    try:
+        fd = os.open(destination, _CREATE_FLAGS, 0o644)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        handle.write(text)
+    return True
+
 
 class ChatIntentBridge:
     """Listen for chat-style commands and emit intent files."""
@@ -32,6 +69,8 @@ class ChatIntentBridge:
         self._intents_dir = intents_dir
         self._mappings = mappings
         self._input = input_func or input
+        # Piped or redirected stdin is read as a buffered stream without prompts.
+        self._interactive = input_func is not None or sys.stdin is None or sys.stdin.isatty()
         self._clock = clock or datetime.utcnow
         self._parser = ChatCommandParser()
         self._sequence = count()
@@ -39,6 +78,7 @@ class ChatIntentBridge:
         self._manifest_path = manifest_path or (default_manifest if default_manifest.exists() else None)
         self._llm_callback = llm_callback
         self._stop_event = Event()
+        self._manifest_cache: Tuple[int, List[router.IntentDefinition]] | None = None
 
     def run(self) -> None:
         """Run an interactive loop until interrupted or "quit" received."""
@@ -51,20 +91,19 @@ class ChatIntentBridge:
         )
 
         try:
-            while not self._stop_event.is_set():
-                line = self._input("> ")
-                if line is None:  # pragma: no cover - defensive, input() never returns None
-                    continue
-                if not line.strip():
-                    continue
-
-                if line.strip().lower() in {"quit", "exit"}:
-                    LOGGER.info("Exit command received; shutting down chat bridge.")
-                    break
-
-                processed = self.process_transcript(line)
-                if processed == 0:
-                    LOGGER.info("No intents emitted. Embed commands with the form [macro:name key=value ...].")
+            if self._interactive:
+                while not self._stop_event.is_set():
+                    line = self._input("> ")
+                    if line is None:  # pragma: no cover - defensive, input() never returns None
+                        continue
+                    if not self._handle_line(line):
+                        break
+            else:
+                for line in sys.stdin:
+                    if self._stop_event.is_set() or not self._handle_line(line.rstrip("\r\n")):
+                        break
+                else:
+                    raise EOFError  # stream exhausted, same as input() at EOF
         except KeyboardInterrupt:
             raise
         except EOFError:
@@ -73,17 +112,32 @@ class ChatIntentBridge:
             self.stop()
             LOGGER.info("Chat bridge stopped.")
 
+    def _handle_line(self, line: str) -> bool:
+        """Process one input line; return ``False`` when the bridge should exit."""
+
+        stripped = line.strip()
+        if not stripped:
+            return True
+
+        if stripped.lower() in {"quit", "exit"}:
+            LOGGER.info("Exit command received; shutting down chat bridge.")
+            return False
+
+        processed = self.process_transcript(line)
+        if processed == 0:
+            LOGGER.info("No intents emitted. Embed commands with the form [macro:name key=value ...].")
+        return True
+
     def _handle_list_intents(self, topic: str | None) -> None:
         if self._manifest_path is None:
             LOGGER.warning("Intent manifest not configured; cannot list intents.")
             return
-        definitions = router.load_intents(self._manifest_path).values()
+        definitions = self._load_definitions()
         topic_norm = (topic or "").strip().lower()
-        matches = []
-        for definition in definitions:
-            haystack = [definition.name.lower(), definition.description.lower(), definition.recipe.lower()] + [syn.lower() for syn in definition.synonyms]
-            if not topic_norm or any(topic_norm in field for field in haystack if field):
-                matches.append(definition)
+        if topic_norm:
+            matches = [definition for definition in definitions if topic_norm in definition.search_text]
+        else:
+            matches = definitions
         if not matches:
             LOGGER.info("No intents matched topic '%s'.", topic)
             return
@@ -93,6 +147,17 @@ class ChatIntentBridge:
             summary = definition.description or definition.recipe or "(no description)"
             LOGGER.info("- %s: %s", definition.name, summary)
 
+    def _load_definitions(self) -> List[router.IntentDefinition]:
+        """Return the manifest's definitions, re-reading it only after it changes."""
+
+        mtime = self._manifest_path.stat().st_mtime_ns
+        cached = self._manifest_cache
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        definitions = list(router.load_intents(self._manifest_path).values())
+        self._manifest_cache = (mtime, definitions)
+        return definitions
+
     def stop(self) -> None:
         """Signal the bridge loop to exit."""
 
@@ -113,14 +178,13 @@ class ChatIntentBridge:
                     self._handle_list_intents(topic)
                     LOGGER.info("Listed intents using topic '%s'", topic)
                     return emitted
-                mapping = self._mappings.get(intent_name)
-                if not mapping:
+                if intent_name not in self._mappings:
                     LOGGER.warning("Routed intent '%s' is not mapped; ignoring", intent_name)
                 else:
                     payload: Dict[str, object] = {"intent": intent_name}
                     if args:
                         payload["args"] = args
-                    dest = self._write_intent(intent_name, payload)
+                    dest = self._write_intent(intent_name, [payload])
                     LOGGER.info("Intent %s written to %s via NL router", intent_name, dest)
                     emitted += 1
                     return emitted
@@ -137,14 +201,13 @@ class ChatIntentBridge:
                         self._handle_list_intents(topic)
                         LOGGER.info("Listed intents via LLM suggestion for topic '%s'", topic)
                         return emitted
-                    mapping = self._mappings.get(intent_name)
-                    if not mapping:
+                    if intent_name not in self._mappings:
                         LOGGER.warning("LLM proposed intent '%s' is not mapped; ignoring", intent_name)
                     else:
                         payload: Dict[str, object] = {'intent': intent_name}
                         if args:
                             payload['args'] = args
-                        dest = self._write_intent(intent_name, payload)
+                        dest = self._write_intent(intent_name, [payload])
                         LOGGER.info("Intent %s written to %s via LLM router", intent_name, dest)
                         emitted += 1
                         return emitted
@@ -152,6 +215,7 @@ class ChatIntentBridge:
         if not commands:
             return emitted
 
+        pending: List[Tuple[str, Dict[str, object]]] = []
         for command in commands:
             if command.name == "list_intents":
                 topic = None
@@ -160,31 +224,49 @@ class ChatIntentBridge:
                 self._handle_list_intents(topic)
                 continue
 
-            mapping = self._mappings.get(command.name)
-            if not mapping:
+            if command.name not in self._mappings:
                 LOGGER.warning("Unmapped intent '%s'; ignoring command %s", command.name, command.source)
                 continue
 
-            payload = command.to_intent_payload()
-            dest = self._write_intent(command.name, payload)
-            LOGGER.info("Intent %s written to %s", command.name, dest)
-            emitted += 1
+            pending.append((command.name, command.to_intent_payload()))
+
+        if pending:
+            # All intents from one transcript go out as a single multi-document file.
+            names = [name for name, _ in pending]
+            label = names[0] if len(names) == 1 else "batch"
+            dest = self._write_intent(label, [payload for _, payload in pending])
+            LOGGER.info("Intent %s written to %s", ", ".join(names), dest)
+            emitted += len(pending)
         return emitted
 
-    def _write_intent(self, intent_name: str, payload: Dict[str, object]) -> Path:
-        self._intents_dir.mkdir(parents=True, exist_ok=True)
+    def _write_intent(self, label: str, payloads: List[Dict[str, object]]) -> Path:
+        """Write *payloads* as one YAML stream and return the published path."""
 
-        for _ in range(100):
-            timestamp = self._clock().strftime("%Y%m%dT%H%M%S")
-            suffix = next(self._sequence)
-            filename = f"{timestamp}_{intent_name}_{suffix:03d}.yml"
-            destination = self._intents_dir / filename
-            if destination.exists():
-                continue
+        # Render once so the file is written with a single write() call.
+        text = yaml.dump_all(payloads, Dumper=_YAML_DUMPER, sort_keys=False)
+        # The sequence counter keeps retries unique, so one timestamp suffices.
+        prefix = f"{self._clock().strftime('%Y%m%dT%H%M%S')}_{label}_"
 
-            with destination.open("w", encoding="utf-8") as handle:
-                yaml.safe_dump(payload, handle, sort_keys=False)
-            return destination
+        # Stage the complete file, then hard-link it into the watched
+        # directory: the watcher only ever sees fully written intents, and
+        # link() fails instead of overwriting when a name is already taken.
+        staging_dir = self._intents_dir / _STAGING_DIRNAME
+        try:
+            fd, staged_name = tempfile.mkstemp(suffix=".tmp", dir=staging_dir)
+        except FileNotFoundError:
+            staging_dir.mkdir(parents=True, exist_ok=True)
+            fd, staged_name = tempfile.mkstemp(suffix=".tmp", dir=staging_dir)
+        staged = Path(staged_name)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(text)
+            for _ in range(100):
+                suffix = str(next(self._sequence)).zfill(3)
+                destination = self._intents_dir / f"{prefix}{suffix}.yml"
+                if _publish(staged, destination, text):
+                    return destination
+        finally:
+            staged.unlink()
 
         raise RuntimeError("Unable to allocate a unique intent filename after multiple attempts.")
 
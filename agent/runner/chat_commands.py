@@ -1,13 +1,19 @@
 """Utilities for parsing automation commands from chat transcripts."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
+import hashlib
 import logging
 import re
-from typing import Callable, Dict, List, Tuple
+import sys
+from typing import Callable, Dict, List
 
 LOGGER = logging.getLogger(__name__)
 
+# ``slots`` is only accepted by dataclass() from Python 3.10 on.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 _COMMAND_PATTERN = re.compile(
     r"\[(?P<prefix>agent|macro)\s*:(?P<name>[a-zA-Z0-9_.-]+)(?P<args>[^\]]*)\]",
@@ -18,20 +24,37 @@ _ARG_PATTERN = re.compile(
 )
 
 
-@dataclass(frozen=True)
+@lru_cache(maxsize=1024)
+def _normalize_key(token: str) -> str:
+    """Lowercase and intern a command name or argument key."""
+
+    return sys.intern(token.lower())
+
+
+@dataclass(frozen=True, **_SLOTS)
 class ChatCommand:
     """A structured representation of an automation command."""
 
     name: str
     args: Dict[str, str]
     source: str
+    _payload: Dict[str, object] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def to_intent_payload(self) -> Dict[str, object]:
-        """Convert the command into an intent payload for downstream macros."""
-
-        payload: Dict[str, object] = {"intent": self.name}
-        if self.args:
-            payload["args"] = self.args
+        """Convert the command into an intent payload for downstream macros.
+
+        The payload is built on first use and shared by later calls, so
+        callers must treat it as read-only.
+        """
+
+        payload = self._payload
+        if payload is None:
+            payload = {"intent": self.name}
+            if self.args:
+                payload["args"] = self.args
+            object.__setattr__(self, "_payload", payload)
         return payload
 
 
@@ -42,11 +65,19 @@ class ChatCommandParser:
         """Extract commands from *transcript* preserving their appearance order."""
 
         commands: List[ChatCommand] = []
+        # Most transcripts carry no commands; rule them out with substring
+        # scans before running the regex.
+        if "[" not in transcript:
+            return commands
+        lowered = transcript.lower()
+        if "macro" not in lowered and "agent" not in lowered:
+            return commands
         for match in _COMMAND_PATTERN.finditer(transcript):
-            raw_args = match.group("args") or ""
-            args = self._parse_args(raw_args)
+            raw_args = match.group("args")
+            # Every argument needs an "=", so skip the arg scan without one.
+            args = self._parse_args(raw_args) if raw_args and "=" in raw_args else {}
             command = ChatCommand(
-                name=match.group("name").lower(),
+                name=_normalize_key(match.group("name")),
                 args=args,
                 source=match.group(0),
             )
@@ -58,18 +89,14 @@ class ChatCommandParser:
     def _parse_args(raw_args: str) -> Dict[str, str]:
         args: Dict[str, str] = {}
         for match in _ARG_PATTERN.finditer(raw_args):
-            key = match.group("key").lower()
+            key = _normalize_key(match.group("key"))
             value = ChatCommandParser._strip_quotes(match.group("value"))
             args[key] = value
         return args
 
     @staticmethod
     def _strip_quotes(value: str) -> str:
-        if not value:
-            return value
-        if (value.startswith('"') and value.endswith('"')) or (
-            value.startswith("'") and value.endswith("'")
-        ):
+        if value and value[0] in "\"'" and value[-1] == value[0]:
             return value[1:-1]
         return value
 
@@ -84,7 +111,7 @@ class ChatCommandWatcher:
     ) -> None:
         self._provider = transcript_provider
         self._parser = parser or ChatCommandParser()
-        self._seen_tokens: set[Tuple[str, Tuple[Tuple[str, str], ...], str]] = set()
+        self._seen_tokens: set[bytes] = set()
 
     def poll(self) -> List[ChatCommand]:
         """Return commands that have not been emitted in previous polls."""
@@ -106,12 +133,10 @@ class ChatCommandWatcher:
         self._seen_tokens.clear()
 
     @staticmethod
-    def _command_token(command: ChatCommand) -> Tuple[str, Tuple[Tuple[str, str], ...], str]:
-        return (
-            command.name,
-            tuple(sorted(command.args.items())),
-            command.source,
-        )
+    def _command_token(command: ChatCommand) -> bytes:
+        # Name and args are both parsed from the source text, so the source
+        # alone identifies the command.
+        return hashlib.blake2b(command.source.encode("utf-8"), digest_size=16).digest()
 
 
 __all__ = ["ChatCommand", "ChatCommandParser", "ChatCommandWatcher"]
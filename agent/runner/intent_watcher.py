@@ -3,10 +3,11 @@ from __future__ import annotations
 
 import logging
 import time
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from threading import Event
-from typing import Any, Dict
+from threading import Event, Lock, Timer
+from typing import Any, Deque, Dict, List, Tuple
 
 _YAML_HELP = "The 'pyyaml' package is required to parse intents. Install it with `pip install pyyaml`."
 _WATCHDOG_HELP = "The 'watchdog' package is required to watch intents. Install it with `pip install watchdog`."
@@ -18,6 +19,8 @@ except ModuleNotFoundError as exc:  # pragma: no cover - dependency guard
     yaml = None  # type: ignore[assignment]
     _YAML_IMPORT_ERROR = exc
 
+_YAML_LOADER = getattr(yaml, "CSafeLoader", None) or getattr(yaml, "SafeLoader", None)
+
 try:
     from agent.runner.steps import RecipeRunner
 except ModuleNotFoundError as exc:
@@ -51,8 +54,11 @@ except ModuleNotFoundError as exc:  # pragma: no cover - dependency guard
 
 LOGGER = logging.getLogger(__name__)
 
-_READ_RETRY_ATTEMPTS = 10
-_READ_RETRY_DELAY = 0.1
+_READ_RETRY_ATTEMPTS = 11
+# Backoff doubles from 1ms, so a full run of retries still waits about 1s.
+_READ_RETRY_INITIAL_DELAY = 0.001
+# Created files are collected for this long and then processed as one batch.
+_BATCH_DEBOUNCE = 0.05
 
 
 @dataclass
@@ -81,6 +87,11 @@ class IntentWatcher(FileSystemEventHandler):
         self._runner = recipe_runner
         self._observer: Observer | None = None
         self._stop_event = Event()
+        self._pending: Deque[Path] = deque()
+        self._pending_lock = Lock()
+        self._batch_timer: Timer | None = None
+        # Held while a batch runs so batches never execute recipes concurrently.
+        self._batch_lock = Lock()
 
     def start(self) -> None:
         self._intents_dir.mkdir(parents=True, exist_ok=True)
@@ -95,25 +106,65 @@ class IntentWatcher(FileSystemEventHandler):
         if self._observer:
             self._observer.stop()
             self._observer.join()
+        with self._pending_lock:
+            timer, self._batch_timer = self._batch_timer, None
+        if timer is not None:
+            timer.cancel()
+        # Waits for a batch already in flight, then runs whatever is still queued.
+        self._process_pending()
         self._stop_event.set()
         LOGGER.info("Intent watcher stopped.")
 
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until :meth:`stop` is called; return ``False`` on timeout."""
+
+        return self._stop_event.wait(timeout)
+
     def on_created(self, event: FileCreatedEvent) -> None:  # type: ignore[override]
         if getattr(event, "is_directory", False):
             return
         path = Path(event.src_path)
         LOGGER.info("New intent detected: %s", path.name)
-        try:
-            self._process_intent(path)
-        except Exception as exc:  # pragma: no cover - defensive logging
-            LOGGER.exception("Failed to process intent %s: %s", path, exc)
-
-    def _load_intent_payload(self, path: Path) -> Dict[str, Any]:
+        with self._pending_lock:
+            self._pending.append(path)
+            if self._batch_timer is None:
+                timer = Timer(_BATCH_DEBOUNCE, self._process_pending)
+                timer.daemon = True
+                self._batch_timer = timer
+                timer.start()
+
+    def _process_pending(self) -> None:
+        with self._batch_lock:
+            with self._pending_lock:
+                self._batch_timer = None
+                batch = list(dict.fromkeys(self._pending))
+                self._pending.clear()
+            for path in batch:
+                try:
+                    self._process_intent(path)
+                except Exception as exc:  # pragma: no cover - defensive logging
+                    LOGGER.exception("Failed to process intent %s: %s", path, exc)
+
+    def _load_intent_payloads(self, path: Path) -> List[Dict[str, Any]]:
         last_error: Exception | None = None
+        previous_size = -1
+        delay = _READ_RETRY_INITIAL_DELAY
         for attempt in range(_READ_RETRY_ATTEMPTS):
+            if attempt:
+                time.sleep(delay)
+                delay *= 2
             try:
-                with path.open("r", encoding="utf-8") as handle:
-                    data = yaml.safe_load(handle)
+                # Only parse once the size holds steady across two looks, so a
+                # file that is still being written is not read half-way.
+                size = path.stat().st_size
+                if size == 0 or size != previous_size:
+                    previous_size = size
+                    continue
+                documents = [
+                    document
+                    for document in yaml.load_all(path.read_bytes(), Loader=_YAML_LOADER)
+                    if document not in (None, "")
+                ]
             except Exception as exc:
                 last_error = exc
                 LOGGER.debug(
@@ -122,40 +173,46 @@ class IntentWatcher(FileSystemEventHandler):
                     path,
                     exc,
                 )
-                time.sleep(_READ_RETRY_DELAY)
                 continue
 
-            if data in (None, ""):
-                time.sleep(_READ_RETRY_DELAY)
+            if not documents:
                 continue
-            if not isinstance(data, dict):
-                raise TypeError(f"Intent file must deserialize to a mapping, got {type(data)!r}.")
-            return data
+            for data in documents:
+                if not isinstance(data, dict):
+                    raise TypeError(f"Intent file must deserialize to a mapping, got {type(data)!r}.")
+            return documents
 
         if last_error is not None:
             raise last_error
         raise RuntimeError(f"Intent file {path} is empty or could not be parsed after retries.")
 
     def _process_intent(self, path: Path) -> None:
-        data = self._load_intent_payload(path)
-
-        intent_name = data.get("intent")
-        if not intent_name:
-            raise RuntimeError(f"Intent file {path} missing required 'intent' field.")
-        if intent_name not in self._mappings:
-            raise RuntimeError(f"Intent '{intent_name}' is not mapped to a recipe.")
-
-        mapping = self._mappings[intent_name]
-        context = data.get("args") or {}
-        if not isinstance(context, dict):
-            raise TypeError("Intent args must be a mapping if provided.")
-        if not mapping.recipe.exists():
-            raise FileNotFoundError(f"Recipe file not found: {mapping.recipe}")
-        self._runner.run_recipe(mapping.recipe, context)
+        # A file may hold several intent documents; validate them all before
+        # running any so a bad entry does not leave the batch half-executed.
+        dispatches: List[Tuple[Path, Dict[str, Any]]] = []
+        intent_names: List[str] = []
+        for data in self._load_intent_payloads(path):
+            intent_name = data.get("intent")
+            if not intent_name:
+                raise RuntimeError(f"Intent file {path} missing required 'intent' field.")
+            if intent_name not in self._mappings:
+                raise RuntimeError(f"Intent '{intent_name}' is not mapped to a recipe.")
+
+            mapping = self._mappings[intent_name]
+            context = data.get("args") or {}
+            if not isinstance(context, dict):
+                raise TypeError("Intent args must be a mapping if provided.")
+            if not mapping.recipe.exists():
+                raise FileNotFoundError(f"Recipe file not found: {mapping.recipe}")
+            dispatches.append((mapping.recipe, context))
+            intent_names.append(intent_name)
+
+        for recipe, context in dispatches:
+            self._runner.run_recipe(recipe, context)
 
         archive_path = self._archive_dir / path.name
         path.rename(archive_path)
-        LOGGER.info("Intent %s archived to %s", intent_name, archive_path)
+        LOGGER.info("Intent %s archived to %s", ", ".join(intent_names), archive_path)
 
 
 __all__ = ["IntentWatcher", "IntentMapping"]
\ No newline at end of file
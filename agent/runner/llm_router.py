@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import Dict
+from typing import Callable, Dict
 
 from agent.schemas.config import LLMConfigSchema, LLMProviderSchema
 
@@ -22,21 +22,28 @@ class LLMRouter:
     def __init__(self, config: LLMConfigSchema) -> None:
         self._config = config
         self._active = config.active_provider
+        self._bind(config.providers[self._active])
 
     def set_active_provider(self, name: str) -> None:
         if name not in self._config.providers:
             raise KeyError(f"LLM provider '{name}' not registered")
         self._active = name
+        self._bind(self._config.providers[name])
         LOGGER.info("LLM active provider set to %s", name)
 
     def active_provider(self) -> LLMProviderSchema:
-        return self._config.providers[self._active]
+        return self._provider
 
     def invoke(self, request: LLMRequest) -> str:
-        provider = self.active_provider()
-        if provider.type == "api":
-            return self._invoke_api(provider, request)
-        return self._invoke_ui(provider, request)
+        return self._invoke(self._provider, request)
+
+    def _bind(self, provider: LLMProviderSchema) -> None:
+        # Resolve the provider and its dispatch method once per switch rather
+        # than on every invoke().
+        self._provider = provider
+        self._invoke: Callable[[LLMProviderSchema, LLMRequest], str] = (
+            self._invoke_api if provider.type == "api" else self._invoke_ui
+        )
 
     def _invoke_api(self, provider: LLMProviderSchema, request: LLMRequest) -> str:
         LOGGER.info(
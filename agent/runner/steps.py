@@ -1,23 +1,46 @@
 ﻿"""Recipe step dispatch for the local RPA agent."""
 from __future__ import annotations
 
+import json
 import logging
+import math
+import os
+import sys
+import tempfile
 from collections.abc import Mapping, Sequence
 from datetime import datetime, timezone
+from functools import lru_cache, partialmethod
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 try:  # pragma: no cover - import guard exercised in tests via fallback
     import yaml  # type: ignore[import-not-found]
 except ImportError:  # pragma: no cover - handled by fallback loader below
     yaml = None
 
+try:  # pragma: no cover - optional accelerator
+    import orjson  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - stdlib json is used instead
+    orjson = None
+
+try:  # pragma: no cover - optional clipboard support
+    import pyperclip  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - clipboard steps raise instead
+    pyperclip = None
+
 from agent.apps.registry import ApplicationProcess, ApplicationRegistry, WindowRecord
 from agent.runner.ui_engine import UIClickEngine, UIElementHandle
 from agent.state.store import StateStore
 
 LOGGER = logging.getLogger(__name__)
 
+_MISSING = object()
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", None) or getattr(yaml, "SafeLoader", None)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", None) or getattr(yaml, "SafeDumper", None)
+# libyaml's emitter needs a C int, so "never wrap" is the largest one.
+_YAML_NO_WRAP = 2**31 - 1
+
 
 class RecipeExecutionError(RuntimeError):
     pass
@@ -26,39 +49,65 @@ class RecipeExecutionError(RuntimeError):
 class RecipeRunner:
     """Execute YAML recipes using typed step handlers."""
 
+    # ``step_*`` methods keyed by their recipe name, e.g. ``app.start`` for
+    # ``step_app_start``; rebuilt for each subclass so overrides and additions
+    # are picked up.
+    _STEP_HANDLERS: Dict[str, Callable[..., None]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._STEP_HANDLERS = _collect_step_handlers(cls)
+
     def __init__(
         self,
         apps: ApplicationRegistry,
         state: StateStore,
         allow_focus_tap: bool,
+        json_cache: bool = False,
     ) -> None:
         self._apps = apps
         self._state = state
         self._ui_engine = UIClickEngine(allow_focus_tap=allow_focus_tap)
+        self._json_cache = json_cache
+        # Recipe step names (``app.start``) resolved to bound handlers.
+        self._handlers: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], None]] = {}
+
+    def preload(self, recipe_paths: Iterable[Path]) -> None:
+        """Parse and validate *recipe_paths* ahead of their first run.
+
+        Broken recipes are logged rather than raised; running them still
+        fails with the original error.
+        """
+
+        for recipe_path in recipe_paths:
+            try:
+                self._load_steps(recipe_path)
+            except Exception as exc:
+                LOGGER.warning("Unable to preload recipe %s: %s", recipe_path, exc)
 
     def run_recipe(self, recipe_path: Path, context: Dict[str, Any]) -> None:
-        with recipe_path.open("r", encoding="utf-8") as handle:
-            data = _load_recipe(handle)
-        steps = data.get("steps", [])
-        if not isinstance(steps, list):
-            raise RecipeExecutionError("Recipe steps must be a list.")
-
-        for idx, step in enumerate(steps, start=1):
-            if not isinstance(step, dict):
-                raise RecipeExecutionError(f"Step {idx} must be a mapping.")
-            if len(step) != 1:
-                raise RecipeExecutionError(f"Step {idx} must contain exactly one instruction.")
-            name, payload = next(iter(step.items()))
+        steps = self._load_steps(recipe_path)
+
+        for idx, (name, payload, payload_keys) in enumerate(steps, start=1):
             LOGGER.info("Executing step %s (%s)", idx, name)
-            handler = getattr(self, f"step_{name.replace('.', '_')}", None)
+            handler = self._handlers.get(name)
             if handler is None:
-                raise RecipeExecutionError(f"Unsupported step '{name}'")
-            payload_data = payload or {}
-            if not isinstance(payload_data, dict):
-                raise RecipeExecutionError(f"Step {name} payload must be a mapping.")
-            metadata = {"step_index": idx, "payload_keys": sorted(payload_data.keys())}
+                handler = self._resolve_handler(name)
+            metadata = {"step_index": idx, "payload_keys": payload_keys}
             with self._state.activity(name, metadata=metadata):
-                handler(payload_data, context)
+                handler(payload, context)
+
+    def _load_steps(self, recipe_path: Path) -> Tuple[_RecipeStep, ...]:
+        stat = recipe_path.stat()
+        return _cached_parse(str(recipe_path), stat.st_mtime_ns, stat.st_size, self._json_cache)
+
+    def _resolve_handler(self, name: str) -> Callable[[Dict[str, Any], Dict[str, Any]], None]:
+        func = self._STEP_HANDLERS.get(name)
+        if func is None:
+            raise RecipeExecutionError(f"Unsupported step '{name}'")
+        handler = func.__get__(self, type(self))
+        self._handlers[name] = handler
+        return handler
 
     def _require_app_name(self, payload: Dict[str, Any], context: Dict[str, Any], action: str) -> str:
         app_name = payload.get("name")
@@ -73,19 +122,12 @@ class RecipeRunner:
         return str(app_name)
 
     def _resolve_target(self, app_name: str, payload: Dict[str, Any], context: Dict[str, Any]) -> Any:
-        if "instance_id" in payload:
-            return payload["instance_id"]
-        if "instance" in payload:
-            return payload["instance"]
-        if "pid" in payload:
-            return int(payload["pid"])
-        if "instance_id" in context:
-            return context["instance_id"]
-        if "instance" in context:
-            return context["instance"]
-        if "pid" in context:
-            return int(context["pid"])
-        target = payload.get("target") if "target" in payload else context.get("target")
+        for source in (payload, context):
+            for key in ("instance_id", "instance", "pid"):
+                value = source.get(key, _MISSING)
+                if value is not _MISSING:
+                    return int(value) if key == "pid" else value
+        target = _pick(payload, context, "target")
         if target:
             return target
         latest = self._state.latest_instance_for(app_name)
@@ -93,7 +135,13 @@ class RecipeRunner:
             return latest
         return "latest"
 
-    def _record_process(self, record: ApplicationProcess, *, status: str | None = None) -> None:
+    def _record_process(
+        self,
+        record: ApplicationProcess,
+        windows: List[Dict[str, Any]],
+        *,
+        status: str | None = None,
+    ) -> None:
         self._state.register_process(
             app=record.definition.name,
             instance_id=record.instance_id,
@@ -102,35 +150,33 @@ class RecipeRunner:
             started_at=record.started_at,
             last_focused_at=record.last_focused_at,
             status=status or "running",
-            windows=self._serialize_windows(record.windows),
+            windows=windows,
         )
 
     @staticmethod
     def _serialize_windows(windows: Dict[int, WindowRecord]) -> List[Dict[str, Any]]:
-        serialized: List[Dict[str, Any]] = []
-        for hwnd, info in windows.items():
-            serialized.append(
-                {
-                    "hwnd": hwnd,
-                    "title": info.title,
-                    "class_name": info.class_name,
-                    "bounds": info.bounds,
-                    "is_visible": info.is_visible,
-                    "is_minimized": info.is_minimized,
-                    "process_name": info.process_name,
-                    "pid": info.pid,
-                    "last_seen": info.last_seen.isoformat() if isinstance(info.last_seen, datetime) else info.last_seen,
-                }
-            )
-        return serialized
+        return [
+            {
+                "hwnd": hwnd,
+                "title": info.title,
+                "class_name": info.class_name,
+                "bounds": info.bounds,
+                "is_visible": info.is_visible,
+                "is_minimized": info.is_minimized,
+                "process_name": info.process_name,
+                "pid": info.pid,
+                "last_seen": info.last_seen.isoformat() if type(info.last_seen) is datetime else info.last_seen,
+            }
+            for hwnd, info in windows.items()
+        ]
 
     def step_app_start(self, payload: Dict[str, Any], context: Dict[str, Any]) -> None:
         app_name = self._require_app_name(payload, context, "app.start")
-        preset = payload.get("preset") if "preset" in payload else context.get("preset")
-        extra_args = payload.get("args") if "args" in payload else context.get("args")
-        env = payload.get("env") if "env" in payload else context.get("env")
-        working_dir = payload.get("working_dir") if "working_dir" in payload else context.get("working_dir")
-        inherit_env = payload.get("inherit_env") if "inherit_env" in payload else context.get("inherit_env")
+        preset = _pick(payload, context, "preset")
+        extra_args = _pick(payload, context, "args")
+        env = _pick(payload, context, "env")
+        working_dir = _pick(payload, context, "working_dir")
+        inherit_env = _pick(payload, context, "inherit_env")
 
         if extra_args is not None and not isinstance(extra_args, (list, tuple)):
             raise RecipeExecutionError("app.start 'args' must be a list of strings.")
@@ -145,10 +191,11 @@ class RecipeRunner:
             inherit_env=inherit_env,
             working_dir=working_dir,
         )
-        self._record_process(record)
+        windows = self._serialize_windows(record.windows)
+        self._record_process(record, windows)
         context["instance_id"] = record.instance_id
         context["pid"] = record.pid
-        _attach_process_metadata(context, record)
+        _attach_process_metadata(context, record, windows)
         LOGGER.info(
             "App %s started with pid=%s (instance=%s)",
             app_name,
@@ -156,73 +203,41 @@ class RecipeRunner:
             record.instance_id,
         )
 
-    def step_app_focus(self, payload: Dict[str, Any], context: Dict[str, Any]) -> None:
-        app_name = self._require_app_name(payload, context, "app.focus")
+    def _do_window_op(
+        self,
+        verb: str,
+        label: str,
+        payload: Dict[str, Any],
+        context: Dict[str, Any],
+        *,
+        record_action: bool = True,
+    ) -> None:
+        app_name = self._require_app_name(payload, context, f"app.{verb}")
         target = self._resolve_target(app_name, payload, context)
-        record = self._apps.focus(app_name, target=target)
+        record = getattr(self._apps, verb)(app_name, target=target)
+        windows = self._serialize_windows(record.windows)
+        updates: Dict[str, Any] = {"last_action": verb} if record_action else {}
         self._state.update_process(
             record.instance_id,
-            windows=self._serialize_windows(record.windows),
             timestamp=_utcnow(),
+            windows=windows,
+            **updates,
         )
         context["instance_id"] = record.instance_id
         context["pid"] = record.pid
-        _attach_process_metadata(context, record)
-        LOGGER.info("Focused app %s (pid=%s)", app_name, record.pid)
-
-    def step_app_minimize(self, payload: Dict[str, Any], context: Dict[str, Any]) -> None:
-        app_name = self._require_app_name(payload, context, "app.minimize")
-        target = self._resolve_target(app_name, payload, context)
-        record = self._apps.minimize(app_name, target=target)
-        now = _utcnow()
-        self._state.update_process(
-            record.instance_id,
-            last_action="minimize",
-            timestamp=now,
-            windows=self._serialize_windows(record.windows),
-        )
-        context["instance_id"] = record.instance_id
-        context["pid"] = record.pid
-        _attach_process_metadata(context, record)
-        LOGGER.info("Minimized app %s (pid=%s)", app_name, record.pid)
+        _attach_process_metadata(context, record, windows)
+        LOGGER.info("%s app %s (pid=%s)", label, app_name, record.pid)
 
-    def step_app_maximize(self, payload: Dict[str, Any], context: Dict[str, Any]) -> None:
-        app_name = self._require_app_name(payload, context, "app.maximize")
-        target = self._resolve_target(app_name, payload, context)
-        record = self._apps.maximize(app_name, target=target)
-        now = _utcnow()
-        self._state.update_process(
-            record.instance_id,
-            last_action="maximize",
-            timestamp=now,
-            windows=self._serialize_windows(record.windows),
-        )
-        context["instance_id"] = record.instance_id
-        context["pid"] = record.pid
-        _attach_process_metadata(context, record)
-        LOGGER.info("Maximized app %s (pid=%s)", app_name, record.pid)
-
-    def step_app_restore(self, payload: Dict[str, Any], context: Dict[str, Any]) -> None:
-        app_name = self._require_app_name(payload, context, "app.restore")
-        target = self._resolve_target(app_name, payload, context)
-        record = self._apps.restore(app_name, target=target)
-        now = _utcnow()
-        self._state.update_process(
-            record.instance_id,
-            last_action="restore",
-            timestamp=now,
-            windows=self._serialize_windows(record.windows),
-        )
-        context["instance_id"] = record.instance_id
-        context["pid"] = record.pid
-        _attach_process_metadata(context, record)
-        LOGGER.info("Restored app %s (pid=%s)", app_name, record.pid)
+    step_app_focus = partialmethod(_do_window_op, "focus", "Focused", record_action=False)
+    step_app_minimize = partialmethod(_do_window_op, "minimize", "Minimized")
+    step_app_maximize = partialmethod(_do_window_op, "maximize", "Maximized")
+    step_app_restore = partialmethod(_do_window_op, "restore", "Restored")
 
     def step_app_close(self, payload: Dict[str, Any], context: Dict[str, Any]) -> None:
         app_name = self._require_app_name(payload, context, "app.close")
-        timeout_ms = payload.get("timeout_ms") if "timeout_ms" in payload else context.get("timeout_ms")
-        force_flag = payload.get("force") if "force" in payload else context.get("force")
-        all_flag = payload.get("all") if "all" in payload else context.get("all")
+        timeout_ms = _pick(payload, context, "timeout_ms")
+        force_flag = _pick(payload, context, "force")
+        all_flag = _pick(payload, context, "all")
         force = bool(force_flag) if force_flag is not None else False
         all_instances = bool(all_flag) if all_flag is not None else False
         timeout = float(timeout_ms) / 1000.0 if timeout_ms is not None else 5.0
@@ -241,7 +256,7 @@ class RecipeRunner:
 
     def step_app_kill(self, payload: Dict[str, Any], context: Dict[str, Any]) -> None:
         app_name = self._require_app_name(payload, context, "app.kill")
-        all_flag = payload.get("all") if "all" in payload else context.get("all")
+        all_flag = _pick(payload, context, "all")
         all_instances = bool(all_flag) if all_flag is not None else False
         records = self._apps.running_processes(app_name)
         self._apps.kill(app_name, all_instances=all_instances)
@@ -276,10 +291,8 @@ class RecipeRunner:
         LOGGER.info("Captured context snapshot under key '%s'", key)
 
     def step_clipboard_copy(self, payload: Dict[str, Any], context: Dict[str, Any]) -> None:
-        try:
-            import pyperclip  # type: ignore[import-not-found]
-        except ImportError as exc:  # pragma: no cover - dependency check
-            raise RecipeExecutionError("clipboard.copy requires the 'pyperclip' package.") from exc
+        if pyperclip is None:  # pragma: no cover - dependency check
+            raise RecipeExecutionError("clipboard.copy requires the 'pyperclip' package.")
 
         key = payload.get("context_key") or context.get("context_key") or payload.get("from_key") or context.get("from_key") or "context_snapshot"
         message = payload.get("message") or context.get("message")
@@ -299,21 +312,31 @@ class RecipeRunner:
         else:
             payload_to_send = data
 
-        serialized = yaml.safe_dump(payload_to_send, sort_keys=False)
+        # JSON is a subset of YAML, so clipboard.load_context reads either;
+        # the YAML emitter is only needed for values JSON cannot express.
+        if _is_json_safe(payload_to_send):
+            serialized = _dumps_json(payload_to_send, indent=True)
+        else:
+            serialized = yaml.dump(
+                payload_to_send,
+                Dumper=_YAML_DUMPER,
+                sort_keys=False,
+                default_flow_style=False,
+                allow_unicode=True,
+                width=_YAML_NO_WRAP,
+            )
         pyperclip.copy(serialized)
         LOGGER.info("Copied context payload to clipboard (%s)", key)
 
     def step_clipboard_load_context(self, payload: Dict[str, Any], context: Dict[str, Any]) -> None:
-        try:
-            import pyperclip  # type: ignore[import-not-found]
-        except ImportError as exc:  # pragma: no cover - dependency check
-            raise RecipeExecutionError("clipboard.load_context requires the 'pyperclip' package.") from exc
+        if pyperclip is None:  # pragma: no cover - dependency check
+            raise RecipeExecutionError("clipboard.load_context requires the 'pyperclip' package.")
 
         raw = pyperclip.paste()
         if not raw:
             raise RecipeExecutionError("Clipboard is empty.")
         try:
-            data = yaml.safe_load(raw)
+            data = yaml.load(raw, Loader=_YAML_LOADER)
         except Exception as exc:
             raise RecipeExecutionError(f"Failed to parse clipboard content: {exc}") from exc
 
@@ -346,14 +369,13 @@ class RecipeRunner:
             raise RecipeExecutionError("assert.expr requires 'expr'.")
 
         expression = _extract_expression(expr)
-        state_namespace = _wrap_eval_namespace(self._state.snapshot())
+        state_namespace = _EvalNamespace(self._state.snapshot())
         context_namespace = _wrap_eval_namespace(context)
 
-        safe_builtins = {"len": len, "min": min, "max": max, "sum": sum, "sorted": sorted, "any": any, "all": all}
         try:
             result = eval(  # noqa: S307 - controlled evaluation context
-                expression,
-                {"__builtins__": safe_builtins},
+                _compile_expression(expression),
+                _EVAL_GLOBALS,
                 {"STATE": state_namespace, "CTX": context_namespace},
             )
         except Exception as exc:  # pragma: no cover - defensive
@@ -371,9 +393,34 @@ class RecipeRunner:
         LOGGER.info("REPORTER: %s", payload.get("message"))
 
 
+def _collect_step_handlers(cls: type) -> Dict[str, Callable[..., None]]:
+    # Recipe names are ``<namespace>.<action>`` and only the first underscore
+    # is the separator: ``step_clipboard_load_context`` is
+    # ``clipboard.load_context``.
+    return {
+        sys.intern(attr[len("step_"):].replace("_", ".", 1)): getattr(cls, attr)
+        for attr in dir(cls)
+        if attr.startswith("step_") and callable(getattr(cls, attr))
+    }
+
+
+RecipeRunner._STEP_HANDLERS = _collect_step_handlers(RecipeRunner)
+
+
 __all__ = ["RecipeRunner", "RecipeExecutionError"]
 
 
+# Expressions cannot rebind globals, so one namespace serves every evaluation.
+_EVAL_GLOBALS: Dict[str, Any] = {
+    "__builtins__": {"len": len, "min": min, "max": max, "sum": sum, "sorted": sorted, "any": any, "all": all},
+}
+
+
+@lru_cache(maxsize=256)
+def _compile_expression(expression: str) -> Any:
+    return compile(expression, "<assert.expr>", "eval")
+
+
 def _extract_expression(expr: str) -> str:
     stripped = expr.strip()
     if stripped.startswith("${") and stripped.endswith("}"):
@@ -381,64 +428,253 @@ def _extract_expression(expr: str) -> str:
     return stripped
 
 
+def _pick(payload: Dict[str, Any], context: Dict[str, Any], *keys: str) -> Any:
+    """Return the first of *keys* present in *payload*, then in *context*.
+
+    Presence wins over truthiness: an explicit ``None`` in the payload still
+    shadows the context value.
+    """
+
+    for source in (payload, context):
+        for key in keys:
+            value = source.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+    return None
+
+
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _attach_process_metadata(context: Dict[str, Any], record: ApplicationProcess) -> None:
+def _attach_process_metadata(
+    context: Dict[str, Any],
+    record: ApplicationProcess,
+    windows: List[Dict[str, Any]],
+) -> None:
     processes = context.setdefault("_apps", {})
     processes[record.definition.name] = {
         "pid": record.pid,
         "preset": record.preset,
         "instance_id": record.instance_id,
-        "windows": RecipeRunner._serialize_windows(record.windows),
-        "started_at": record.started_at.isoformat(),
-        "last_focused_at": record.last_focused_at.isoformat() if record.last_focused_at else None,
+        "windows": windows,
+        "started_at": _isoformat(record.started_at),
+        "last_focused_at": _isoformat(record.last_focused_at) if record.last_focused_at else None,
     }
 
 
+def _loads_json(text: str | bytes) -> Any:
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+
+def _dumps_json(value: Any, *, indent: bool = False) -> str:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+    return json.dumps(value, indent=2 if indent else None, ensure_ascii=False)
+
+
+def _is_json_safe(value: Any, seen: Optional[Set[int]] = None) -> bool:
+    """Return whether *value* is built only from plain JSON types."""
+
+    kind = type(value)
+    if kind is str or kind is bool or value is None:
+        return True
+    if kind is int:
+        # orjson only encodes 64-bit integers.
+        return -(1 << 63) <= value < (1 << 64)
+    if kind is float:
+        return math.isfinite(value)
+    if kind is dict or kind is list or kind is tuple:
+        # Repeated containers (e.g. a snapshot that captured itself) are left
+        # to the YAML dumper, which writes them as anchors.
+        if seen is None:
+            seen = set()
+        if id(value) in seen:
+            return False
+        seen.add(id(value))
+        if kind is dict:
+            return all(type(key) is str and _is_json_safe(item, seen) for key, item in value.items())
+        return all(_is_json_safe(item, seen) for item in value)
+    return False
+
+
+def _isoformat(value: datetime) -> str:
+    # Equal datetimes in different zones compare equal but format differently,
+    # so the zone is part of the cache key.
+    return _cached_isoformat(value, value.tzinfo)
+
+
+@lru_cache(maxsize=256)
+def _cached_isoformat(value: datetime, tzinfo: Any) -> str:
+    return value.isoformat()
+
+
 class _EvalNamespace:
-    """Provide attribute and key access for nested mappings during eval."""
+    """Provide attribute and key access for nested mappings during eval.
+
+    Children are wrapped on first access and remembered, so an expression
+    only pays for the parts of the data it actually reads.
+    """
 
     def __init__(self, data: Mapping[str, Any]) -> None:
-        self._data = {key: _wrap_eval_namespace(value) for key, value in data.items()}
+        self._data = data
+        self._wrapped: Dict[Any, Any] = {}
 
     def __getattr__(self, item: str) -> Any:
         try:
-            return self._data[item]
+            return self[item]
         except KeyError as exc:  # pragma: no cover - defensive
             raise AttributeError(item) from exc
 
     def __getitem__(self, key: str) -> Any:
-        return self._data[key]
+        try:
+            return self._wrapped[key]
+        except KeyError:
+            pass
+        value = _wrap_eval_namespace(self._data[key])
+        self._wrapped[key] = value
+        return value
 
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         return f"_EvalNamespace({self._data!r})"
 
 
 def _wrap_eval_namespace(value: Any) -> Any:
-    if isinstance(value, _EvalNamespace):
+    # Loaded recipes, contexts and snapshots hold plain builtins, so exact
+    # type checks settle nearly every value before the ABC checks below.
+    kind = type(value)
+    if kind in _EVAL_SCALARS or kind is _EvalNamespace:
         return value
+    if kind is dict:
+        return _EvalNamespace(value)
+    if kind is list or kind is tuple:
+        return _wrap_eval_sequence(value)
     if isinstance(value, Mapping):
         return _EvalNamespace(value)
     if isinstance(value, Sequence) and not isinstance(value, (str, bytes, bytearray)):
-        return type(value)(_wrap_eval_namespace(item) for item in value)
+        return _wrap_eval_sequence(value)
     return value
 
 
-def _load_recipe(handle: Any) -> Dict[str, Any]:
-    text = handle.read()
+def _wrap_eval_sequence(value: Sequence[Any]) -> Any:
+    if all(type(item) in _EVAL_SCALARS for item in value):
+        # Nothing to wrap. Tuples are shared; other sequences are still
+        # copied so an expression cannot mutate the underlying data.
+        return value if type(value) is tuple else type(value)(value)
+    # Items are wrapped one level deep; nested mappings stay lazy.
+    return type(value)(map(_wrap_eval_namespace, value))
+
+
+_EVAL_SCALARS = frozenset({str, int, float, bool, bytes, type(None)})
 
+
+@lru_cache(maxsize=128)
+def _cached_parse(path: str, mtime_ns: int, size: int, json_cache: bool = False) -> Tuple[_RecipeStep, ...]:
+    """Parse and validate the recipe at *path*; the stat fields key out edited files.
+
+    With *json_cache* the parsed recipe is also kept in a JSON file beside
+    the source, so later processes can skip the YAML parse. The returned
+    steps are shared between runs and their payloads must not be mutated.
+    """
+
+    source = {"mtime_ns": mtime_ns, "size": size}
+    cache_path = path + _JSON_CACHE_SUFFIX
+    data = _read_json_cache(cache_path, source) if json_cache else None
+    if data is None:
+        with open(path, "rb") as handle:
+            data = _load_recipe(handle)
+        if json_cache and yaml is not None:
+            _write_json_cache(cache_path, source, data)
+    return _compile_steps(data)
+
+
+# ``(name, payload, sorted payload keys)`` for one validated recipe step.
+_RecipeStep = Tuple[str, Dict[str, Any], Tuple[str, ...]]
+
+
+def _compile_steps(data: Dict[str, Any]) -> Tuple[_RecipeStep, ...]:
+    steps = data.get("steps", [])
+    if not isinstance(steps, list):
+        raise RecipeExecutionError("Recipe steps must be a list.")
+
+    compiled: List[_RecipeStep] = []
+    for idx, step in enumerate(steps, start=1):
+        # Loaded recipes only ever contain plain dicts, so exact type checks
+        # are enough here.
+        if type(step) is not dict:
+            raise RecipeExecutionError(f"Step {idx} must be a mapping.")
+        try:
+            ((name, payload),) = step.items()
+        except ValueError:
+            raise RecipeExecutionError(f"Step {idx} must contain exactly one instruction.") from None
+        if type(name) is not str:
+            raise RecipeExecutionError(f"Step {idx} instruction must be a string.")
+        if payload is None:
+            payload = {}
+        elif type(payload) is not dict:
+            raise RecipeExecutionError(f"Step {name} payload must be a mapping.")
+        compiled.append((sys.intern(name), payload, tuple(sorted(payload))))
+    return tuple(compiled)
+
+
+_JSON_CACHE_SUFFIX = ".cache.json"
+
+
+def _read_json_cache(cache_path: str, source: Dict[str, int]) -> Dict[str, Any] | None:
+    try:
+        with open(cache_path, "rb") as handle:
+            cached = _loads_json(handle.read())
+    except (OSError, ValueError):
+        return None
+    # The cache records the stat of the YAML it was built from; comparing it
+    # exactly avoids trusting a cache written within the same mtime tick.
+    if not isinstance(cached, dict) or cached.get("source") != source:
+        return None
+    recipe = cached.get("recipe")
+    return recipe if isinstance(recipe, dict) else None
+
+
+def _write_json_cache(cache_path: str, source: Dict[str, int], data: Dict[str, Any]) -> None:
+    try:
+        text = _dumps_json({"source": source, "recipe": data})
+    except (TypeError, ValueError):
+        LOGGER.debug("Recipe %s is not JSON-serializable; skipping cache", cache_path)
+        return
+    if _loads_json(text)["recipe"] != data:
+        # Non-string keys or tuples would not survive the round trip.
+        LOGGER.debug("Recipe %s does not round-trip through JSON; skipping cache", cache_path)
+        return
+
+    directory = os.path.dirname(cache_path) or "."
+    try:
+        fd, staged_name = tempfile.mkstemp(suffix=".tmp", dir=directory)
+    except OSError as exc:
+        LOGGER.debug("Unable to write recipe cache %s: %s", cache_path, exc)
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(staged_name, cache_path)
+    except OSError as exc:
+        LOGGER.debug("Unable to write recipe cache %s: %s", cache_path, exc)
+        try:
+            os.unlink(staged_name)
+        except OSError:
+            pass
+
+
+def _load_recipe(handle: Any) -> Dict[str, Any]:
     if yaml is not None:
-        data = yaml.safe_load(text) or {}
+        # The loader pulls from the binary stream itself, so the recipe is
+        # never held as one decoded string.
+        data = yaml.load(handle, Loader=_YAML_LOADER) or {}
         if not isinstance(data, dict):
             raise RecipeExecutionError("Recipe must decode to a mapping.")
         return data
 
-    import json
-
+    text = handle.read()
     try:
-        data = json.loads(text or "{}")
+        data = _loads_json(text or b"{}")
     except json.JSONDecodeError as exc:  # pragma: no cover - defensive
         raise RecipeExecutionError(
             "Failed to parse recipe. Install PyYAML to enable YAML support."
@@ -7,6 +7,7 @@ from enum import Enum
 from typing import Callable, Optional
 
 LOGGER = logging.getLogger(__name__)
+_DEBUG = logging.DEBUG
 
 
 class ClickMethod(str, Enum):
@@ -20,6 +21,9 @@ class ClickMethod(str, Enum):
     FOCUS_TAP = "focus_tap"
 
 
+_FOCUS_TAP = ClickMethod.FOCUS_TAP
+
+
 @dataclass
 class UIElementHandle:
     """Thin abstraction around UI elements to facilitate testing."""
@@ -28,33 +32,47 @@ class UIElementHandle:
     is_enabled: bool = True
 
     def invoke(self) -> bool:
-        LOGGER.debug("Invoking element %s via UIA Invoke pattern", self.identifier)
+        if LOGGER.isEnabledFor(_DEBUG):
+            LOGGER.debug("Invoking element %s via UIA Invoke pattern", self.identifier)
         return True
 
     def toggle(self) -> bool:
-        LOGGER.debug("Toggling element %s via UIA Toggle pattern", self.identifier)
+        if LOGGER.isEnabledFor(_DEBUG):
+            LOGGER.debug("Toggling element %s via UIA Toggle pattern", self.identifier)
         return True
 
     def select(self) -> bool:
-        LOGGER.debug("Selecting element %s via UIA SelectionItem pattern", self.identifier)
+        if LOGGER.isEnabledFor(_DEBUG):
+            LOGGER.debug("Selecting element %s via UIA SelectionItem pattern", self.identifier)
         return True
 
     def msaa_default_action(self) -> bool:
-        LOGGER.debug("Executing MSAA default action for %s", self.identifier)
+        if LOGGER.isEnabledFor(_DEBUG):
+            LOGGER.debug("Executing MSAA default action for %s", self.identifier)
         return True
 
     def send_bm_click(self) -> bool:
-        LOGGER.debug("Sending BM_CLICK message to %s", self.identifier)
+        if LOGGER.isEnabledFor(_DEBUG):
+            LOGGER.debug("Sending BM_CLICK message to %s", self.identifier)
         return True
 
     def focus_tap(self) -> bool:
-        LOGGER.debug("Performing focus-tap fallback for %s", self.identifier)
+        if LOGGER.isEnabledFor(_DEBUG):
+            LOGGER.debug("Performing focus-tap fallback for %s", self.identifier)
         return True
 
 
 class UIClickEngine:
     """Resolve click methods based on guardrails and element state."""
 
+    _RESOLUTION_ORDER: tuple[tuple[ClickMethod, Callable[[UIElementHandle], bool]], ...] = (
+        (ClickMethod.INVOKE, UIElementHandle.invoke),
+        (ClickMethod.TOGGLE, UIElementHandle.toggle),
+        (ClickMethod.SELECTION, UIElementHandle.select),
+        (ClickMethod.MSAA, UIElementHandle.msaa_default_action),
+        (ClickMethod.BM_CLICK, UIElementHandle.send_bm_click),
+    )
+
     def __init__(self, allow_focus_tap: bool) -> None:
         self.allow_focus_tap = allow_focus_tap
 
@@ -62,15 +80,7 @@ class UIClickEngine:
         if not element.is_enabled:
             raise RuntimeError("Cannot interact with disabled element.")
 
-        resolution_order: tuple[tuple[ClickMethod, Callable[[UIElementHandle], bool]], ...] = (
-            (ClickMethod.INVOKE, UIElementHandle.invoke),
-            (ClickMethod.TOGGLE, UIElementHandle.toggle),
-            (ClickMethod.SELECTION, UIElementHandle.select),
-            (ClickMethod.MSAA, UIElementHandle.msaa_default_action),
-            (ClickMethod.BM_CLICK, UIElementHandle.send_bm_click),
-        )
-
-        for method, action in resolution_order:
+        for method, action in self._RESOLUTION_ORDER:
             try:
                 result = action(element)
             except Exception as exc:  # pragma: no cover - defensive logging
@@ -82,8 +92,8 @@ class UIClickEngine:
 
         if self.allow_focus_tap:
             if element.focus_tap():
-                LOGGER.info("UI click resolved using %s for %s", ClickMethod.FOCUS_TAP, element.identifier)
-                return ClickMethod.FOCUS_TAP
+                LOGGER.info("UI click resolved using %s for %s", _FOCUS_TAP, element.identifier)
+                return _FOCUS_TAP
 
         raise RuntimeError("Unable to resolve click method for element.")
 
@@ -6,10 +6,16 @@ just enough structure and validation for the surrounding modules and tests.
 """
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Literal, Mapping, Optional
 
+# Config objects live for the whole run; slots keep them small. ``slots=`` is
+# only accepted from Python 3.10 on.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 def _ensure_list(values: Optional[Iterable[str]]) -> List[str]:
     if values is None:
@@ -17,7 +23,24 @@ def _ensure_list(values: Optional[Iterable[str]]) -> List[str]:
     return list(values)
 
 
-@dataclass
+_SINGLE_INSTANCE = frozenset({"detect", "force", "allow"})
+_PROVIDER_TYPES = frozenset({"api", "ui"})
+_SCRAPE_STRATEGIES = frozenset({"uia", "clipboard", "ocr"})
+
+
+def _choice(value: Any, allowed: frozenset[str], name: str) -> str:
+    """Validate a ``Literal`` field and intern it so comparisons hit identity."""
+
+    if not isinstance(value, str) or value not in allowed:
+        raise ValueError(f"{name} must be one of {sorted(allowed)}, not {value!r}.")
+    return sys.intern(value)
+
+
+def _optional_choice(value: Any, allowed: frozenset[str], name: str) -> Optional[str]:
+    return None if value is None else _choice(value, allowed, name)
+
+
+@dataclass(frozen=True, **_SLOTS)
 class SelectorSchema:
     name: Optional[str] = None
     control_type: Optional[str] = None
@@ -27,15 +50,30 @@ class SelectorSchema:
     @classmethod
     def from_dict(cls, data: Mapping[str, Any] | None) -> "SelectorSchema":
         data = data or {}
-        return cls(
-            name=data.get("name"),
-            control_type=data.get("controlType", data.get("control_type")),
-            automation_id=data.get("automationId", data.get("automation_id")),
-            role=data.get("role"),
+        values = (
+            data.get("name"),
+            data.get("controlType", data.get("control_type")),
+            data.get("automationId", data.get("automation_id")),
+            data.get("role"),
         )
+        try:
+            return _intern_selector(*values)
+        except TypeError:  # unhashable values; validation is left to callers
+            return cls(*values)
+
+
+# The leaf schemas below are frozen, so equal configs can share one instance.
+@lru_cache(maxsize=1024, typed=True)
+def _intern_selector(
+    name: Optional[str],
+    control_type: Optional[str],
+    automation_id: Optional[str],
+    role: Optional[str],
+) -> SelectorSchema:
+    return SelectorSchema(name, control_type, automation_id, role)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class WindowSchema:
     title_match: Optional[str] = None
     class_match: Optional[str] = None
@@ -54,12 +92,12 @@ class WindowSchema:
             process_name=data.get("process_name"),
             must_appear_within_ms=int(data.get("must_appear_within_ms", 10000)),
             bring_to_front=bool(data.get("bring_to_front", True)),
-            single_instance=data.get("single_instance", "detect"),
+            single_instance=_choice(data.get("single_instance", "detect"), _SINGLE_INSTANCE, "single_instance"),
             activation_retry_ms=int(data.get("activation_retry_ms", 250)),
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class SandboxPolicySchema:
     filesystem_read: List[str] = field(default_factory=list)
     filesystem_write: List[str] = field(default_factory=list)
@@ -77,7 +115,7 @@ class SandboxPolicySchema:
         )
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ElevationPolicySchema:
     allow: bool = False
     require_approval: bool = False
@@ -85,13 +123,18 @@ class ElevationPolicySchema:
     @classmethod
     def from_dict(cls, data: Mapping[str, Any] | None) -> "ElevationPolicySchema":
         data = data or {}
-        return cls(
-            allow=bool(data.get("allow", False)),
-            require_approval=bool(data.get("require_approval", False)),
+        return _intern_elevation(
+            bool(data.get("allow", False)),
+            bool(data.get("require_approval", False)),
         )
 
 
-@dataclass
+@lru_cache(maxsize=4)
+def _intern_elevation(allow: bool, require_approval: bool) -> ElevationPolicySchema:
+    return ElevationPolicySchema(allow=allow, require_approval=require_approval)
+
+
+@dataclass(**_SLOTS)
 class PolicySchema:
     idle_only: bool = True
     foreground_required: bool = True
@@ -113,7 +156,7 @@ class PolicySchema:
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class HealthSchema:
     ready_selector: SelectorSchema = field(default_factory=SelectorSchema)
     ready_timeout_ms: int = 15000
@@ -133,7 +176,7 @@ class HealthSchema:
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AppHooksSchema:
     pre_start: List[str] = field(default_factory=list)
     post_start: List[str] = field(default_factory=list)
@@ -151,7 +194,7 @@ class AppHooksSchema:
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AppConfigSchema:
     description: str = ""
     enabled: bool = True
@@ -201,7 +244,7 @@ class AppConfigSchema:
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AppRegistrySchema:
     apps: Dict[str, AppConfigSchema] = field(default_factory=dict)
 
@@ -215,7 +258,7 @@ class AppRegistrySchema:
         return self.apps
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class LLMProviderSchema:
     type: Literal["api", "ui"]
     provider: str
@@ -234,19 +277,19 @@ class LLMProviderSchema:
             for name, selector in dict(data.get("selectors", {})).items()
         }
         return cls(
-            type=data.get("type", "api"),
+            type=_choice(data.get("type", "api"), _PROVIDER_TYPES, "type"),
             provider=data.get("provider", ""),
             model=data.get("model"),
             api_key=data.get("api_key"),
             endpoint=data.get("endpoint"),
             app=data.get("app"),
             selectors=selectors,
-            scrape_strategy=data.get("scrape_strategy"),
+            scrape_strategy=_optional_choice(data.get("scrape_strategy"), _SCRAPE_STRATEGIES, "scrape_strategy"),
             max_chars=data.get("max_chars"),
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class LLMConfigSchema:
     active_provider: str
     providers: Dict[str, LLMProviderSchema]
@@ -264,7 +307,7 @@ class LLMConfigSchema:
         return cls(active_provider=data.get("active_provider", ""), providers=providers)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ProfileToggleSchema:
     idle_only: bool
     foreground_required: bool
@@ -285,7 +328,7 @@ class ProfileToggleSchema:
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ProfileDefinitionSchema:
     description: str
     toggles: ProfileToggleSchema
@@ -298,7 +341,7 @@ class ProfileDefinitionSchema:
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ProfilesSchema:
     default: str
     definitions: Dict[str, ProfileDefinitionSchema]
@@ -316,7 +359,7 @@ class ProfilesSchema:
         return cls(default=data.get("default", ""), definitions=definitions)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class StateAccountSchema:
     cash_free: float = 0.0
 
@@ -326,16 +369,19 @@ class StateAccountSchema:
         return cls(cash_free=float(data.get("cash_free", 0.0)))
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class StateSchema:
     accounts: Dict[str, StateAccountSchema] = field(default_factory=dict)
     market: Dict[str, str] = field(default_factory=dict)
 
     def __post_init__(self) -> None:
-        self.accounts = {
-            name: account if isinstance(account, StateAccountSchema) else StateAccountSchema.from_dict(account)
-            for name, account in self.accounts.items()
-        }
+        # ``from_dict`` already builds account schemas; only raw mappings
+        # passed by direct callers need converting.
+        if not all(type(account) is StateAccountSchema for account in self.accounts.values()):
+            self.accounts = {
+                name: account if isinstance(account, StateAccountSchema) else StateAccountSchema.from_dict(account)
+                for name, account in self.accounts.items()
+            }
         self.market = dict(self.market)
 
     @classmethod
@@ -344,11 +390,11 @@ class StateSchema:
             name: StateAccountSchema.from_dict(account)
             for name, account in dict(data.get("accounts", {})).items()
         }
-        market = dict(data.get("market", {}))
-        return cls(accounts=accounts, market=market)
+        # ``__post_init__`` takes the copy of the market mapping.
+        return cls(accounts=accounts, market=data.get("market", {}))
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class SafetySchema:
     panic_hotkey: str = "ctrl+alt+shift+esc"
 
@@ -362,7 +408,7 @@ class SafetySchema:
         if not value:
             raise ValueError("Safety panic_hotkey must be a non-empty string.")
         return cls(panic_hotkey=value)
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class FeatureFlagsSchema:
     chat_bridge: bool = True
     ocr_intents: bool = True
@@ -370,12 +416,17 @@ class FeatureFlagsSchema:
     @classmethod
     def from_dict(cls, data: Mapping[str, Any] | None) -> "FeatureFlagsSchema":
         data = data or {}
-        return cls(
-            chat_bridge=bool(data.get("chat_bridge", True)),
-            ocr_intents=bool(data.get("ocr_intents", True)),
+        return _intern_feature_flags(
+            bool(data.get("chat_bridge", True)),
+            bool(data.get("ocr_intents", True)),
         )
 
-@dataclass
+
+@lru_cache(maxsize=4)
+def _intern_feature_flags(chat_bridge: bool, ocr_intents: bool) -> FeatureFlagsSchema:
+    return FeatureFlagsSchema(chat_bridge=chat_bridge, ocr_intents=ocr_intents)
+
+@dataclass(**_SLOTS)
 class IntentsSchema:
     directory: Path
     archive_directory: Path
@@ -388,16 +439,20 @@ class IntentsSchema:
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class RecipesSchema:
     directory: Path
+    json_cache: bool = False
 
     @classmethod
     def from_dict(cls, data: Mapping[str, Any]) -> "RecipesSchema":
-        return cls(directory=Path(data.get("directory")))
+        return cls(
+            directory=Path(data.get("directory")),
+            json_cache=bool(data.get("json_cache", False)),
+        )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ConnectorConfigSchema:
     profiles: ProfilesSchema
     intents: IntentsSchema
@@ -21,11 +21,31 @@ def test_parse_hotkey_rejects_multiple_keys() -> None:
         parse_hotkey("ctrl+a+b")
 
 
-class _StubUser32:
+class _StubKernel32:
     def __init__(self) -> None:
+        self.events: dict[int, threading.Event] = {}
+        self.closed: list[int] = []
+
+    def CreateEventW(self, attributes, manual_reset, initial_state, name) -> int:  # noqa: N802
+        handle = len(self.events) + 1
+        self.events[handle] = threading.Event()
+        return handle
+
+    def SetEvent(self, handle: int) -> int:  # noqa: N802
+        self.events[handle].set()
+        return 1
+
+    def CloseHandle(self, handle: int) -> int:  # noqa: N802
+        self.closed.append(handle)
+        return 1
+
+
+class _StubUser32:
+    def __init__(self, kernel32: _StubKernel32) -> None:
         self.registered: list[tuple[int, int, int]] = []
         self.unregistered: list[tuple[object | None, int]] = []
-        self._messages: list[tuple[int, int, int]] = []
+        self._kernel32 = kernel32
+        self._messages: list[tuple[int, int]] = []
         self._lock = threading.Lock()
         self._event = threading.Event()
 
@@ -37,41 +57,36 @@ class _StubUser32:
         self.unregistered.append((hwnd, identifier))
         return 1
 
-    def PostThreadMessageW(self, thread_id: int, message: int, wparam: int, lparam: int) -> int:
-        self._enqueue((0, message, wparam))
-        return 1
-
     def enqueue_hotkey(self, identifier: int) -> None:
-        self._enqueue((1, WM_HOTKEY, identifier))
-
-    def _enqueue(self, payload: tuple[int, int, int]) -> None:
         with self._lock:
-            self._messages.append(payload)
+            self._messages.append((WM_HOTKEY, identifier))
             self._event.set()
 
-    def GetMessageW(self, msg_ptr, hwnd, min_msg, max_msg) -> int:  # noqa: N802
-        if not self._event.wait(timeout=0.5):
-            return 0
+    def MsgWaitForMultipleObjects(self, count, handles, wait_all, timeout, wake_mask) -> int:  # noqa: N802
+        stop = self._kernel32.events[handles[0]]
+        while True:
+            if stop.is_set():
+                return 0
+            if self._event.wait(timeout=0.01):
+                return count
+
+    def PeekMessageW(self, msg_ptr, hwnd, min_msg, max_msg, remove) -> int:  # noqa: N802
         with self._lock:
-            result, message, wparam = self._messages.pop(0)
             if not self._messages:
                 self._event.clear()
+                return 0
+            message, wparam = self._messages.pop(0)
         target = getattr(msg_ptr, "contents", None)
         if target is None:
             target = msg_ptr._obj
         target.message = message
         target.wParam = wparam
-        return result
-
-
-class _StubKernel32:
-    def GetCurrentThreadId(self) -> int:  # noqa: N802
-        return 1234
+        return 1
 
 
 def test_hotkey_listener_invokes_callback() -> None:
-    user32 = _StubUser32()
     kernel32 = _StubKernel32()
+    user32 = _StubUser32(kernel32)
     triggered = threading.Event()
 
     def _callback() -> None:
@@ -93,6 +108,22 @@ def test_hotkey_listener_invokes_callback() -> None:
 
     assert user32.registered, "hotkey was not registered"
     assert user32.unregistered, "hotkey was not unregistered"
+    assert kernel32.closed == [1], "stop event handle was not closed"
 
 
+def test_hotkey_listener_keeps_event_open_while_thread_runs() -> None:
+    kernel32 = _StubKernel32()
+    user32 = _StubUser32(kernel32)
+    listener = GlobalHotKeyListener("ctrl+esc", lambda: None, user32_module=user32, kernel32_module=kernel32)
+    release = threading.Event()
+    stuck = threading.Thread(target=release.wait, daemon=True)
+    stuck.start()
+    listener._thread = stuck
+    listener._stop_handle = kernel32.CreateEventW(None, True, False, None)
+
+    try:
+        listener.stop()
+    finally:
+        release.set()
 
+    assert kernel32.closed == [], "stop event closed while the listener thread was alive"
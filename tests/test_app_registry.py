@@ -15,8 +15,10 @@ class _StubWindowManager:
     def __init__(self) -> None:
         self._snapshots: dict[str, List[WindowSnapshot]] = {}
         self._next_handle = 100
+        self.snapshot_calls = 0
 
     def snapshot_windows(self, definition) -> List[WindowSnapshot]:
+        self.snapshot_calls += 1
         return list(self._snapshots.get(definition.name, []))
 
     def wait_for_window(self, definition, pid=None, *, timeout=5.0, interval=0.2):
@@ -57,7 +59,7 @@ class _StubWindowManager:
         return True
 
 
-def _registry(single_instance: str = "detect") -> ApplicationRegistry:
+def _registry(single_instance: str = "detect", **kwargs) -> ApplicationRegistry:
     config = {
         "demo": {
             "path": sys.executable,
@@ -69,7 +71,7 @@ def _registry(single_instance: str = "detect") -> ApplicationRegistry:
         }
     }
     schema = AppRegistrySchema.from_dict(config)
-    return ApplicationRegistry(schema.root, wm=_StubWindowManager())
+    return ApplicationRegistry(schema.root, wm=_StubWindowManager(), **kwargs)
 
 
 def _cleanup(registry: ApplicationRegistry) -> None:
@@ -130,3 +132,50 @@ def test_select_record_by_instance_id() -> None:
         assert fetched.instance_id == record.instance_id
     finally:
         _cleanup(registry)
+
+
+def test_window_snapshots_are_shared_within_ttl() -> None:
+    registry = _registry(snapshot_ttl=60.0)
+    try:
+        registry.start("demo")
+        wm = registry._window_manager
+        wm.snapshot_calls = 0
+
+        registry.focus("demo")
+        registry.minimize("demo")
+        assert wm.snapshot_calls == 0
+
+        registry._invalidate_snapshots("demo")
+        registry.restore("demo")
+        assert wm.snapshot_calls == 1
+    finally:
+        _cleanup(registry)
+
+
+def test_select_record_by_pid() -> None:
+    registry = _registry(single_instance="allow")
+    try:
+        first = registry.start("demo")
+        second = registry.start("demo")
+        assert registry.focus("demo", target=first.pid) is first
+        assert registry.focus("demo", target=str(second.pid)) is second
+        assert registry.focus("demo", target="first") is first
+        assert registry.focus("demo") is second
+    finally:
+        _cleanup(registry)
+
+
+def test_unchanged_windows_reuse_records() -> None:
+    registry = _registry()
+    try:
+        record = registry.start("demo")
+        registry._window_manager.wait_for_window(record.definition, pid=record.pid)
+        registry._invalidate_snapshots("demo")
+        registry.focus("demo")
+        (window,) = record.windows.values()
+
+        registry._invalidate_snapshots("demo")
+        registry.focus("demo")
+        assert record.windows[window.hwnd] is window
+    finally:
+        _cleanup(registry)
@@ -1,8 +1,11 @@
 ﻿from __future__ import annotations
 
+import logging
+import os
 from datetime import datetime
 from pathlib import Path
 
+import pytest
 import yaml
 
 from agent.runner.chat_bridge import ChatIntentBridge
@@ -31,6 +34,51 @@ def test_bridge_writes_intent_file(tmp_path: Path) -> None:
     }
 
 
+def test_bridge_skips_existing_intent_filenames(tmp_path: Path) -> None:
+    intents_dir = tmp_path / "intents"
+    intents_dir.mkdir()
+    taken = intents_dir / "20240101T120000_export_quotes_001.yml"
+    taken.write_text("intent: other\n", encoding="utf-8")
+    bridge = ChatIntentBridge(
+        intents_dir=intents_dir,
+        mappings={"export_quotes": IntentMapping(recipe=Path("dummy"))},
+        clock=lambda: datetime(2024, 1, 1, 12, 0, 0),
+    )
+
+    bridge.process_transcript("[macro:export_quotes]")
+    bridge.process_transcript("[macro:export_quotes]")
+
+    assert taken.read_text(encoding="utf-8") == "intent: other\n"
+    assert sorted(path.name for path in intents_dir.glob("*.yml")) == [
+        "20240101T120000_export_quotes_000.yml",
+        "20240101T120000_export_quotes_001.yml",
+        "20240101T120000_export_quotes_002.yml",
+    ]
+
+
+def test_bridge_writes_directly_without_hard_links(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def _no_links(source: object, destination: object) -> None:
+        raise PermissionError("hard links are not supported")
+
+    monkeypatch.setattr(os, "link", _no_links)
+    intents_dir = tmp_path / "intents"
+    intents_dir.mkdir()
+    taken = intents_dir / "20240101T120000_export_quotes_000.yml"
+    taken.write_text("intent: other\n", encoding="utf-8")
+    bridge = ChatIntentBridge(
+        intents_dir=intents_dir,
+        mappings={"export_quotes": IntentMapping(recipe=Path("dummy"))},
+        clock=lambda: datetime(2024, 1, 1, 12, 0, 0),
+    )
+
+    assert bridge.process_transcript("[macro:export_quotes]") == 1
+
+    written = intents_dir / "20240101T120000_export_quotes_001.yml"
+    assert "export_quotes" in written.read_text(encoding="utf-8")
+    assert taken.read_text(encoding="utf-8") == "intent: other\n"
+    assert not list((intents_dir / ".staging").iterdir())
+
+
 def test_bridge_ignores_unknown_intents(tmp_path: Path) -> None:
     intents_dir = tmp_path / "intents"
     bridge = ChatIntentBridge(
@@ -61,9 +109,9 @@ def test_bridge_handles_multiple_commands(tmp_path: Path) -> None:
     emitted = bridge.process_transcript(transcript)
 
     assert emitted == 2
-    payloads = []
-    for path in sorted(intents_dir.glob("*.yml")):
-        payloads.append(yaml.safe_load(path.read_text(encoding="utf-8")))
+    files = list(intents_dir.glob("*.yml"))
+    assert len(files) == 1
+    payloads = list(yaml.safe_load_all(files[0].read_text(encoding="utf-8")))
     assert {
         "intent": "export_quotes",
         "args": {"symbol": "AAPL"},
@@ -151,3 +199,27 @@ intents:
     assert emitted == 1
     payload = yaml.safe_load(next(intents_dir.glob("*.yml")).read_text(encoding="utf-8"))
     assert payload == {"intent": "app_launch", "args": {"name": "calc"}}
+
+
+def test_bridge_lists_intents_from_edited_manifest(tmp_path: Path, caplog) -> None:
+    manifest = tmp_path / "manifest.yml"
+    manifest.write_text("intents:\n  - intent: app_launch\n    recipe: app.launch.yml\n")
+    bridge = ChatIntentBridge(
+        intents_dir=tmp_path / "intents",
+        mappings={},
+        manifest_path=manifest,
+    )
+
+    with caplog.at_level(logging.INFO, logger="agent.runner.chat_bridge"):
+        bridge.process_transcript("[macro:list_intents]")
+        manifest.write_text(
+            "intents:\n"
+            "  - intent: app_launch\n    recipe: app.launch.yml\n"
+            "  - intent: app_close\n    recipe: app.close.yml\n"
+        )
+        stat = manifest.stat()
+        os.utime(manifest, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        bridge.process_transcript("[macro:list_intents]")
+
+    summaries = [record.getMessage() for record in caplog.records if "Intent catalog" in record.getMessage()]
+    assert summaries == ["Intent catalog (1 matches)", "Intent catalog (2 matches)"]
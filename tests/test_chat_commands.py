@@ -1,8 +1,11 @@
 """Tests for chat command parsing and watching."""
 from __future__ import annotations
 
+import sys
 from typing import List
 
+import pytest
+
 from agent.runner.chat_commands import ChatCommandParser, ChatCommandWatcher
 
 
@@ -20,6 +23,20 @@ def test_parser_extracts_commands_with_arguments() -> None:
     }
 
 
+def test_intent_payload_is_built_once() -> None:
+    command = ChatCommandParser().parse("[macro:export_quotes symbol=AAPL]")[0]
+
+    assert command.to_intent_payload() is command.to_intent_payload()
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+def test_chat_command_has_no_instance_dict() -> None:
+    command = ChatCommandParser().parse("[macro:export_quotes symbol=AAPL]")[0]
+
+    assert not hasattr(command, "__dict__")
+    assert command == ChatCommandParser().parse("[macro:export_quotes symbol=AAPL]")[0]
+
+
 def test_parser_supports_quoted_arguments() -> None:
     parser = ChatCommandParser()
     transcript = "[agent:trade symbol=\"MSFT\" note='enter long']"
@@ -0,0 +1,29 @@
+"""Tests for configuration environment expansion."""
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from agent.core.config_loader import _expand
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "$AGENT_HOME/recipes",
+        "${AGENT_HOME}\\intents",
+        "%AGENT_HOME%\\logs",
+        "'$AGENT_HOME'",
+        "$$AGENT_HOME",
+        "%%AGENT_HOME%%",
+        "100% of $AGENT_HOME",
+        "${AGENT_HOME/$AGENT_HOME",
+        "$MISSING_AGENT_VAR/$AGENT-HOME",
+    ],
+)
+def test_expand_matches_expandvars(monkeypatch: pytest.MonkeyPatch, value: str) -> None:
+    monkeypatch.setenv("AGENT_HOME", "C:/agent")
+    monkeypatch.delenv("MISSING_AGENT_VAR", raising=False)
+
+    assert _expand(value, {}) == os.path.expandvars(value)
@@ -0,0 +1,106 @@
+"""Tests for the intent directory watcher."""
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+from agent.runner.intent_watcher import IntentMapping, IntentWatcher
+
+
+class _RecordingRunner:
+    def __init__(self, expected: int) -> None:
+        self.calls: List[Tuple[Path, Dict[str, object]]] = []
+        self._expected = expected
+        self.done = threading.Event()
+
+    def run_recipe(self, recipe: Path, context: Dict[str, object]) -> None:
+        self.calls.append((recipe, context))
+        if len(self.calls) >= self._expected:
+            self.done.set()
+
+
+def test_watcher_batches_created_intents(tmp_path: Path) -> None:
+    intents_dir = tmp_path / "intents"
+    archive_dir = tmp_path / "archive"
+    intents_dir.mkdir()
+    archive_dir.mkdir()
+    recipe = tmp_path / "recipe.yml"
+    recipe.write_text("steps: []\n", encoding="utf-8")
+
+    first = intents_dir / "first.yml"
+    first.write_text("intent: demo\nargs:\n  n: 1\n", encoding="utf-8")
+    second = intents_dir / "second.yml"
+    second.write_text("intent: demo\nargs:\n  n: 2\n", encoding="utf-8")
+
+    runner = _RecordingRunner(expected=2)
+    watcher = IntentWatcher(intents_dir, archive_dir, {"demo": IntentMapping(recipe=recipe)}, runner)
+
+    for path in (first, second, first):
+        watcher.on_created(SimpleNamespace(src_path=str(path), is_directory=False))
+
+    assert runner.done.wait(timeout=2.0), "queued intents were not processed"
+    deadline = time.monotonic() + 2.0
+    while len(list(archive_dir.iterdir())) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    watcher.stop()
+
+    assert [context for _, context in runner.calls] == [{"n": 1}, {"n": 2}]
+    assert sorted(path.name for path in archive_dir.iterdir()) == ["first.yml", "second.yml"]
+
+
+def test_watcher_runs_every_document_in_a_batch_file(tmp_path: Path) -> None:
+    intents_dir = tmp_path / "intents"
+    archive_dir = tmp_path / "archive"
+    intents_dir.mkdir()
+    archive_dir.mkdir()
+    recipe = tmp_path / "recipe.yml"
+    recipe.write_text("steps: []\n", encoding="utf-8")
+    batch = intents_dir / "batch.yml"
+    batch.write_text("intent: demo\nargs:\n  n: 1\n---\nintent: demo\n", encoding="utf-8")
+
+    runner = _RecordingRunner(expected=2)
+    watcher = IntentWatcher(intents_dir, archive_dir, {"demo": IntentMapping(recipe=recipe)}, runner)
+    watcher._process_intent(batch)
+
+    assert [context for _, context in runner.calls] == [{"n": 1}, {}]
+    assert (archive_dir / "batch.yml").exists()
+
+
+class _SlowRunner(_RecordingRunner):
+    def __init__(self, expected: int) -> None:
+        super().__init__(expected)
+        self.started = threading.Event()
+
+    def run_recipe(self, recipe: Path, context: Dict[str, object]) -> None:
+        self.started.set()
+        time.sleep(0.2)
+        super().run_recipe(recipe, context)
+
+
+def test_watcher_stop_finishes_in_flight_and_queued_intents(tmp_path: Path) -> None:
+    intents_dir = tmp_path / "intents"
+    archive_dir = tmp_path / "archive"
+    intents_dir.mkdir()
+    archive_dir.mkdir()
+    recipe = tmp_path / "recipe.yml"
+    recipe.write_text("steps: []\n", encoding="utf-8")
+
+    first = intents_dir / "first.yml"
+    first.write_text("intent: demo\nargs:\n  n: 1\n", encoding="utf-8")
+    second = intents_dir / "second.yml"
+    second.write_text("intent: demo\nargs:\n  n: 2\n", encoding="utf-8")
+
+    runner = _SlowRunner(expected=2)
+    watcher = IntentWatcher(intents_dir, archive_dir, {"demo": IntentMapping(recipe=recipe)}, runner)
+
+    watcher.on_created(SimpleNamespace(src_path=str(first), is_directory=False))
+    assert runner.started.wait(timeout=2.0), "first batch never started"
+    watcher.on_created(SimpleNamespace(src_path=str(second), is_directory=False))
+    watcher.stop()
+
+    assert runner.done.is_set()
+    assert [context for _, context in runner.calls] == [{"n": 1}, {"n": 2}]
+    assert sorted(path.name for path in archive_dir.iterdir()) == ["first.yml", "second.yml"]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 from agent.nlp import llm_router
@@ -27,3 +28,17 @@ def test_llm_route_handles_invalid_json(tmp_path: Path) -> None:
         call_model=lambda prompt: "not json",
     )
     assert result is None
+
+
+def test_build_prompt_picks_up_manifest_edits(tmp_path: Path) -> None:
+    manifest = tmp_path / "manifest.yml"
+    manifest.write_text("intents:\n  - intent: first_intent\n", encoding="utf-8")
+    assert "first_intent" in llm_router.build_prompt("hi", manifest)
+
+    manifest.write_text("intents:\n  - intent: second_intent\n", encoding="utf-8")
+    stat = manifest.stat()
+    os.utime(manifest, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    prompt = llm_router.build_prompt("hi", manifest)
+    assert "second_intent" in prompt
+    assert "first_intent" not in prompt
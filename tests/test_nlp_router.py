@@ -1,6 +1,7 @@
 ﻿"""Tests for the natural-language router."""
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 from agent.nlp import router
@@ -39,3 +40,38 @@ def test_router_matches_list_intents():
     intent, args = result
     assert intent == "intent_list"
     assert args.get("topic") == "browser"
+
+
+def test_router_reloads_edited_manifest(tmp_path: Path):
+    manifest = tmp_path / "manifest.yml"
+    manifest.write_text(
+        "intents:\n  - intent: alpha_intent\n    synonyms: [do alpha]\n",
+        encoding="utf-8",
+    )
+    assert router.route("do alpha", manifest_path=manifest) == ("alpha_intent", {})
+
+    manifest.write_text(
+        "intents:\n  - intent: beta_intent\n    synonyms: [do alpha]\n",
+        encoding="utf-8",
+    )
+    stat = manifest.stat()
+    os.utime(manifest, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert router.route("do alpha", manifest_path=manifest) == ("beta_intent", {})
+
+
+def test_router_results_are_independent_copies():
+    first = router.route("launch app name=notepad", manifest_path=MANIFEST)
+    assert first is not None
+    first[1]["name"] = "changed"
+
+    second = router.route("launch app name=notepad", manifest_path=MANIFEST)
+    assert second == ("app_launch", {"name": "notepad"})
+
+
+def test_parse_args_searches_topic_over_full_utterance():
+    assert router.parse_args("open url=https://example.com/about now") == {
+        "url": "https://example.com/about",
+        "topic": "now",
+    }
+    assert router.parse_args("value=for x") == {"value": "for", "topic": "x"}
@@ -1,11 +1,15 @@
 """Tests for recipe runner step handlers."""
 from __future__ import annotations
 
+import json
 from pathlib import Path
-from unittest.mock import MagicMock
+from types import SimpleNamespace
+from typing import Dict
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+from agent.runner import steps
 from agent.runner.steps import RecipeExecutionError, RecipeRunner
 from agent.schemas.config import StateSchema
 from agent.state.store import StateStore
@@ -79,3 +83,119 @@ def test_run_recipe_records_failures(tmp_path: Path) -> None:
     assert history[-1]["name"] == "assert.expr"
     assert history[-1]["status"] == "failed"
     assert "Expression" in (history[-1]["error"] or "")
+
+
+def test_run_recipe_reparses_edited_recipe(tmp_path: Path) -> None:
+    recipe_path = tmp_path / "edited.yaml"
+    recipe_path.write_text("""steps:\n  - sleep.ms:\n      duration: 1\n""", encoding="utf-8")
+    runner = _build_runner()
+
+    runner.run_recipe(recipe_path, {})
+    runner.run_recipe(recipe_path, {})
+    recipe_path.write_text(
+        """steps:\n  - reporter.note:\n      message: changed\n""",
+        encoding="utf-8",
+    )
+    runner.run_recipe(recipe_path, {})
+
+    history = runner._state.snapshot()["activity"]["history"]
+    assert [record["name"] for record in history] == ["sleep.ms", "sleep.ms", "reporter.note"]
+
+
+@pytest.mark.parametrize("step", ["{}", "{sleep.ms: {}, reporter.note: {}}"])
+def test_run_recipe_rejects_steps_without_single_instruction(tmp_path: Path, step: str) -> None:
+    recipe_path = tmp_path / "invalid.yaml"
+    recipe_path.write_text(f"steps:\n  - {step}\n", encoding="utf-8")
+    runner = _build_runner()
+
+    with pytest.raises(RecipeExecutionError, match="exactly one instruction"):
+        runner.run_recipe(recipe_path, {})
+
+
+def test_run_recipe_reuses_json_cache(tmp_path: Path) -> None:
+    recipe_path = tmp_path / "cached.yaml"
+    recipe_path.write_text("""steps:\n  - sleep.ms:\n      duration: 1\n""", encoding="utf-8")
+    cache_path = tmp_path / "cached.yaml.cache.json"
+    runner = RecipeRunner(apps=MagicMock(), state=StateStore(StateSchema()), allow_focus_tap=False, json_cache=True)
+
+    runner.run_recipe(recipe_path, {})
+    assert cache_path.exists()
+
+    # A fresh process only has the file cache; the YAML must not be re-read.
+    steps._cached_parse.cache_clear()
+    with patch.object(steps, "_load_recipe", side_effect=AssertionError("YAML re-parsed")):
+        runner.run_recipe(recipe_path, {})
+
+    history = runner._state.snapshot()["activity"]["history"]
+    assert [record["name"] for record in history] == ["sleep.ms", "sleep.ms"]
+
+
+def test_assert_expr_sees_state_changes_between_evaluations() -> None:
+    runner = _build_runner()
+    expr = {"expr": "${STATE.processes['pid-1'].status == 'running'}"}
+    runner._state.update_process("pid-1", status="running")
+
+    runner.step_assert_expr(expr, {})
+    runner.step_assert_expr(expr, {})
+    runner._state.update_process("pid-1", status="closed")
+
+    with pytest.raises(RecipeExecutionError):
+        runner.step_assert_expr(expr, {})
+
+
+def test_clipboard_round_trips_json_snapshot(monkeypatch: pytest.MonkeyPatch) -> None:
+    clipboard: Dict[str, str] = {}
+    fake = SimpleNamespace(copy=lambda text: clipboard.update(text=text), paste=lambda: clipboard["text"])
+    monkeypatch.setattr(steps, "pyperclip", fake)
+    runner = _build_runner()
+    context = {"_captures": {"snap": {"symbol": "AAPL", "levels": [1, 2.5, None]}}}
+
+    runner.step_clipboard_copy({"context_key": "snap", "message": "hi"}, context)
+    assert json.loads(clipboard["text"]) == {
+        "message": "hi",
+        "snapshot": {"symbol": "AAPL", "levels": [1, 2.5, None]},
+    }
+
+    loaded: Dict[str, object] = {}
+    runner.step_clipboard_load_context({"context_key": "pasted"}, loaded)
+    assert loaded["snapshot"] == {"symbol": "AAPL", "levels": [1, 2.5, None]}
+
+
+def test_clipboard_copies_self_referencing_snapshot_as_yaml(monkeypatch: pytest.MonkeyPatch) -> None:
+    clipboard: Dict[str, str] = {}
+    fake = SimpleNamespace(copy=lambda text: clipboard.update(text=text), paste=lambda: clipboard["text"])
+    monkeypatch.setattr(steps, "pyperclip", fake)
+    runner = _build_runner()
+    context: Dict[str, object] = {}
+
+    runner.step_context_snapshot({"context_key": "first"}, context)
+    runner.step_context_snapshot({"context_key": "second"}, context)
+    runner.step_clipboard_copy({"context_key": "second"}, context)
+
+    loaded = steps.yaml.load(clipboard["text"], Loader=steps._YAML_LOADER)
+    assert "first" in loaded["context"]["_captures"]
+
+
+def test_run_recipe_validates_every_step_before_running(tmp_path: Path) -> None:
+    recipe_path = tmp_path / "late_error.yaml"
+    recipe_path.write_text("""steps:\n  - sleep.ms: {}\n  - reporter.note: oops\n""", encoding="utf-8")
+    runner = _build_runner()
+
+    with pytest.raises(RecipeExecutionError, match="payload must be a mapping"):
+        runner.run_recipe(recipe_path, {})
+
+    assert runner._state.snapshot()["activity"]["history"] == []
+
+
+def test_preload_parses_recipes_and_logs_broken_ones(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    good = tmp_path / "good.yaml"
+    good.write_text("""steps:\n  - sleep.ms: {}\n""", encoding="utf-8")
+    broken = tmp_path / "broken.yaml"
+    broken.write_text("""steps: nope\n""", encoding="utf-8")
+    runner = _build_runner()
+    steps._cached_parse.cache_clear()
+
+    runner.preload([good, broken, tmp_path / "missing.yaml"])
+
+    assert steps._cached_parse.cache_info().currsize == 1
+    assert sum("Unable to preload recipe" in message for message in caplog.messages) == 2